@@ -1,11 +1,15 @@
 """
 Appointment API endpoints.
 """
+import hashlib
 import logging
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
-from typing import List
-import base64
+import time
+import orjson
+from collections import OrderedDict
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
+from typing import Optional
 
 from backend.models.schemas import (
     AppointmentCreate,
@@ -15,112 +19,240 @@ from backend.models.schemas import (
 from backend.services.appointment_service import (
     create_appointment_with_ics,
     get_appointment,
-    get_all_appointments
+    get_appointment_ics,
+    get_all_appointments,
+    register_change_listener
 )
 from backend.database.providers import get_provider_by_id
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/appointments", tags=["appointments"])
+router = APIRouter(
+    prefix="/api/appointments",
+    tags=["appointments"],
+    default_response_class=ORJSONResponse
+)
+
+# In-process response cache for hot GET endpoints (would be Redis in production).
+# Appointment list pages are cached per (limit, offset) with a short TTL and
+# invalidated when a new appointment is created. The key is client-controlled,
+# so the cache is bounded like the idempotency cache below: expired entries are
+# dropped on read and the oldest keys are evicted beyond a size cap.
+_CACHE_TTL_SECONDS = 60.0
+_CACHE_MAX_ENTRIES = 1000
+_list_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _invalidate_response_cache():
+    """Invalidate cached GET responses after a write."""
+    _list_cache.clear()
+    logger.debug("[appointments.py._invalidate_response_cache] Response cache invalidated")
+
+
+def _get_cached_list(cache_key: tuple) -> Optional[list]:
+    """Return the cached list page for a key, dropping it if expired."""
+    entry = _list_cache.get(cache_key)
+    if entry is None:
+        return None
+    expires_at, content = entry
+    if expires_at <= time.monotonic():
+        del _list_cache[cache_key]
+        return None
+    return content
+
+
+def _store_cached_list(cache_key: tuple, content: list):
+    """Cache a list page for a key, evicting the oldest beyond the cap."""
+    _list_cache[cache_key] = (time.monotonic() + _CACHE_TTL_SECONDS, content)
+    while len(_list_cache) > _CACHE_MAX_ENTRIES:
+        _list_cache.popitem(last=False)
+
+
+# Registered at the service layer so every write path invalidates the cache,
+# including appointments booked through the conversation tool calls
+register_change_listener(_invalidate_response_cache)
+
+
+def _make_etag(payload: bytes) -> str:
+    """Build a strong ETag for a response payload."""
+    return f'"{hashlib.md5(payload).hexdigest()}"'
+
+
+# Confirmations already issued per Idempotency-Key, so retried create requests
+# (client timeouts, double submits) don't book a second slot. Bounded like the
+# in-process conversation store: entries expire after a TTL and the oldest
+# keys are evicted beyond a size cap, so the cache can't grow without limit.
+_IDEMPOTENCY_TTL_SECONDS = 3600.0
+_IDEMPOTENCY_MAX_ENTRIES = 1000
+_idempotency_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _get_idempotent_confirmation(idempotency_key: str) -> Optional[AppointmentConfirmation]:
+    """Return the stored confirmation for a key, dropping it if expired."""
+    entry = _idempotency_cache.get(idempotency_key)
+    if entry is None:
+        return None
+    expires_at, confirmation = entry
+    if expires_at <= time.monotonic():
+        del _idempotency_cache[idempotency_key]
+        return None
+    return confirmation
+
+
+def _store_idempotent_confirmation(idempotency_key: str, confirmation: AppointmentConfirmation):
+    """Store a confirmation for a key, evicting the oldest beyond the cap."""
+    _idempotency_cache[idempotency_key] = (time.monotonic() + _IDEMPOTENCY_TTL_SECONDS, confirmation)
+    while len(_idempotency_cache) > _IDEMPOTENCY_MAX_ENTRIES:
+        _idempotency_cache.popitem(last=False)
 
 
 @router.post("/", response_model=AppointmentConfirmation)
-async def create_new_appointment(appointment_data: AppointmentCreate):
+async def create_new_appointment(
+    appointment_data: AppointmentCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create a new appointment and generate .ics file.
-    
+
+    Clients may send an Idempotency-Key header; retried requests with the
+    same key return the original confirmation without booking again.
+
     Args:
         appointment_data: Appointment details
-        
+        idempotency_key: Optional client-supplied idempotency key
+
     Returns:
         AppointmentConfirmation with .ics file
     """
-    logger.info(f"[appointments.py.create_new_appointment] Creating appointment for patient: {appointment_data.patient_name}, provider: {appointment_data.provider_id}")
-    
+    if idempotency_key:
+        cached = _get_idempotent_confirmation(idempotency_key)
+        if cached:
+            logger.info("[appointments.py.create_new_appointment] Duplicate request for idempotency key: %s, returning stored confirmation", idempotency_key)
+            return cached
+
+    logger.info("[appointments.py.create_new_appointment] Creating appointment for patient: %s, provider: %s", appointment_data.patient_name, appointment_data.provider_id)
+
     # Validate provider exists
     provider = get_provider_by_id(appointment_data.provider_id)
     if not provider:
-        logger.error(f"[appointments.py.create_new_appointment] Provider not found: {appointment_data.provider_id}")
+        logger.error("[appointments.py.create_new_appointment] Provider not found: %s", appointment_data.provider_id)
         raise HTTPException(status_code=404, detail="Provider not found")
     
-    logger.debug(f"[appointments.py.create_new_appointment] Provider validated: {provider.name}")
+    logger.debug("[appointments.py.create_new_appointment] Provider validated: %s", provider.name)
     
-    # Create appointment
-    confirmation = create_appointment_with_ics(appointment_data)
+    # Create appointment. Booking the slot persists the schedule CSV to disk,
+    # so run it in the threadpool instead of blocking the event loop.
+    confirmation = await run_in_threadpool(create_appointment_with_ics, appointment_data)
     if not confirmation:
-        logger.error(f"[appointments.py.create_new_appointment] Failed to create appointment for provider: {appointment_data.provider_id}, date: {appointment_data.date}, time: {appointment_data.time}")
+        logger.error("[appointments.py.create_new_appointment] Failed to create appointment for provider: %s, date: %s, time: %s", appointment_data.provider_id, appointment_data.date, appointment_data.time)
         raise HTTPException(
             status_code=400,
             detail="Failed to create appointment. The time slot may no longer be available."
         )
     
-    logger.info(f"[appointments.py.create_new_appointment] Appointment created successfully: {confirmation.appointment_id}")
+    logger.info("[appointments.py.create_new_appointment] Appointment created successfully: %s", confirmation.appointment_id)
+    if idempotency_key:
+        _store_idempotent_confirmation(idempotency_key, confirmation)
     return confirmation
 
 
-@router.get("/{appointment_id}", response_model=Appointment)
-async def get_appointment_by_id(appointment_id: str):
+@router.get("/{appointment_id}")
+async def get_appointment_by_id(appointment_id: str, request: Request):
     """
     Get an appointment by ID.
-    
+
+    Supports conditional requests: responses carry an ETag and a matching
+    If-None-Match header short-circuits to 304 Not Modified.
+
     Args:
         appointment_id: Appointment ID
-        
+        request: Incoming request (for If-None-Match)
+
     Returns:
         Appointment details
     """
-    logger.info(f"[appointments.py.get_appointment_by_id] Fetching appointment: {appointment_id}")
-    
+    logger.info("[appointments.py.get_appointment_by_id] Fetching appointment: %s", appointment_id)
+
     appointment = get_appointment(appointment_id)
     if not appointment:
-        logger.warning(f"[appointments.py.get_appointment_by_id] Appointment not found: {appointment_id}")
+        logger.warning("[appointments.py.get_appointment_by_id] Appointment not found: %s", appointment_id)
         raise HTTPException(status_code=404, detail="Appointment not found")
-    
-    logger.debug(f"[appointments.py.get_appointment_by_id] Appointment retrieved: {appointment.patient_name} with {appointment.provider_name}")
-    return appointment
 
+    logger.debug("[appointments.py.get_appointment_by_id] Appointment retrieved: %s with %s", appointment.patient_name, appointment.provider_name)
+
+    payload = orjson.dumps(appointment.model_dump())
+    etag = _make_etag(payload)
+    if request.headers.get("if-none-match") == etag:
+        logger.debug("[appointments.py.get_appointment_by_id] ETag match, returning 304")
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
-@router.get("/", response_model=List[Appointment])
-async def list_appointments():
+
+@router.get("/")
+async def list_appointments(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of appointments to return"),
+    offset: int = Query(0, ge=0, description="Number of appointments to skip")
+):
     """
-    List all appointments.
-    
+    List appointments, optionally paginated.
+
+    Args:
+        limit: Maximum number of appointments to return (default: all)
+        offset: Number of appointments to skip
+
     Returns:
-        List of all appointments
+        List of appointments
     """
-    logger.info("[appointments.py.list_appointments] Fetching all appointments")
-    appointments = get_all_appointments()
-    logger.debug(f"[appointments.py.list_appointments] Retrieved {len(appointments)} appointments")
-    return appointments
+    cache_key = (limit, offset)
+    cached = _get_cached_list(cache_key)
+    if cached is not None:
+        logger.debug("[appointments.py.list_appointments] Returning cached appointment list")
+        return ORJSONResponse(content=cached)
+
+    logger.info("[appointments.py.list_appointments] Fetching appointments")
+    appointments = get_all_appointments(limit=limit, offset=offset)
+    logger.debug("[appointments.py.list_appointments] Retrieved %d appointments", len(appointments))
+
+    # Dump the models once so repeated requests skip re-encoding each model
+    content = [appointment.model_dump() for appointment in appointments]
+    _store_cached_list(cache_key, content)
+    return ORJSONResponse(content=content)
 
 
 @router.get("/{appointment_id}/ics")
-async def download_ics_file(appointment_id: str):
+async def download_ics_file(appointment_id: str, request: Request):
     """
     Download .ics file for an appointment.
-    
+
+    Supports conditional requests: responses carry an ETag and a matching
+    If-None-Match header short-circuits to 304 Not Modified.
+
     Args:
         appointment_id: Appointment ID
-        
+        request: Incoming request (for If-None-Match)
+
     Returns:
         .ics file as downloadable attachment
     """
-    logger.info(f"[appointments.py.download_ics_file] Downloading ICS file for appointment: {appointment_id}")
-    
-    appointment = get_appointment(appointment_id)
-    if not appointment:
-        logger.warning(f"[appointments.py.download_ics_file] Appointment not found: {appointment_id}")
+    logger.info("[appointments.py.download_ics_file] Downloading ICS file for appointment: %s", appointment_id)
+
+    ics_bytes = get_appointment_ics(appointment_id)
+    if ics_bytes is None:
+        logger.warning("[appointments.py.download_ics_file] Appointment not found: %s", appointment_id)
         raise HTTPException(status_code=404, detail="Appointment not found")
-    
-    # Generate fresh .ics file
-    from backend.services.appointment_service import generate_ics_file
-    ics_bytes = generate_ics_file(appointment)
-    
-    logger.debug(f"[appointments.py.download_ics_file] Generated ICS file for appointment: {appointment_id}")
-    
+
+    etag = _make_etag(ics_bytes)
+    if request.headers.get("if-none-match") == etag:
+        logger.debug("[appointments.py.download_ics_file] ETag match, returning 304")
+        return Response(status_code=304, headers={"ETag": etag})
+
+    logger.debug("[appointments.py.download_ics_file] Serving ICS file for appointment: %s", appointment_id)
+
     return Response(
         content=ics_bytes,
         media_type="text/calendar",
         headers={
+            "ETag": etag,
             "Content-Disposition": f"attachment; filename=appointment_{appointment_id}.ics"
         }
     )
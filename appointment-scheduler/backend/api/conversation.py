@@ -1,9 +1,12 @@
 """
 Conversation API endpoints for LLM-powered appointment scheduling.
 """
-import json
+import asyncio
 import logging
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from backend.models.schemas import ConversationRequest, ConversationResponse
 from backend.models.constants import ConversationState
 from backend.llm.client import LLMClient
@@ -17,21 +20,37 @@ from backend.services.schedule_service import (
 from backend.services.appointment_service import create_appointment
 from backend.models.schemas import AppointmentCreate
 from backend.database.providers import get_provider_by_id
+from backend.database.schedules import register_change_listener as register_schedule_listener
 from backend.config import config
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/conversation", tags=["conversation"])
+router = APIRouter(
+    prefix="/api/conversation",
+    tags=["conversation"],
+    default_response_class=ORJSONResponse
+)
 
-# Global conversation manager (in production, use a proper store)
+# Global conversation manager (Redis-backed when REDIS_URL is configured,
+# in-process otherwise)
 conversation_manager = ConversationManager()
 
+# Function tool definitions, resolved once at import
+_TOOLS = get_function_tools()
+
+# The static system prompt never changes, so its message dict is built once
+# and shared as a fixed prefix across every turn (it is never mutated)
+_STATIC_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": conversation_manager.get_static_system_prompt()
+}
+
 # Initialize LLM client
 try:
     logger.info("[conversation.py.root] Initializing LLM client")
     llm_client = LLMClient(model=config.OPENAI_MODEL)
-    logger.info(f"[conversation.py.root] LLM client initialized with model: {config.OPENAI_MODEL}")
+    logger.info("[conversation.py.root] LLM client initialized with model: %s", config.OPENAI_MODEL)
 except ValueError as e:
-    logger.error(f"[conversation.py.root] Failed to initialize LLM client: {e}")
+    logger.error("[conversation.py.root] Failed to initialize LLM client: %s", e)
     llm_client = None
 
 
@@ -46,7 +65,7 @@ async def handle_conversation(request: ConversationRequest):
     Returns:
         Assistant response with updated conversation state
     """
-    logger.info(f"[conversation.py.handle_conversation] Received message: '{request.message[:50]}...' for conversation: {request.conversation_id}")
+    logger.info("[conversation.py.handle_conversation] Received message: '%s...' for conversation: %s", request.message[:50], request.conversation_id)
     
     if not llm_client:
         logger.error("[conversation.py.handle_conversation] LLM client not configured")
@@ -58,92 +77,96 @@ async def handle_conversation(request: ConversationRequest):
     # Get or create conversation
     conversation_id = request.conversation_id
     if not conversation_id:
-        conversation_id = conversation_manager.create_conversation()
-        logger.info(f"[conversation.py.handle_conversation] Created new conversation: {conversation_id}")
+        conversation_id = await conversation_manager.create_conversation()
+        logger.info("[conversation.py.handle_conversation] Created new conversation: %s", conversation_id)
     else:
-        logger.debug(f"[conversation.py.handle_conversation] Using existing conversation: {conversation_id}")
+        logger.debug("[conversation.py.handle_conversation] Using existing conversation: %s", conversation_id)
     
     # Add user message
-    conversation_manager.add_message(conversation_id, "user", request.message)
-    logger.debug(f"[conversation.py.handle_conversation] Added user message to conversation: {conversation_id}")
-    
-    # Get conversation history and system prompt
-    messages = conversation_manager.get_messages(conversation_id)
-    system_prompt = conversation_manager.get_system_prompt(conversation_id)
+    await conversation_manager.add_message(conversation_id, "user", request.message)
+    logger.debug("[conversation.py.handle_conversation] Added user message to conversation: %s", conversation_id)
     
-    # Prepend system message
-    full_messages = [{"role": "system", "content": system_prompt}] + messages
-    logger.debug(f"[conversation.py.handle_conversation] Prepared {len(full_messages)} messages for LLM")
+    # Get conversation history and system prompts. The static prompt is
+    # byte-identical across turns so the provider can reuse its prompt cache;
+    # per-turn context (date/time, state guidance) rides in a second system
+    # message after it.
+    messages = await conversation_manager.get_messages_for_llm(conversation_id)
+    dynamic_prompt = await conversation_manager.get_dynamic_system_prompt(conversation_id)
+
+    full_messages = [
+        _STATIC_SYSTEM_MESSAGE,
+        {"role": "system", "content": dynamic_prompt},
+        *messages
+    ]
+    logger.debug("[conversation.py.handle_conversation] Prepared %s messages for LLM", len(full_messages))
     
     # Get LLM response with function calling
-    tools = get_function_tools()
+    tools = _TOOLS
     logger.debug("[conversation.py.handle_conversation] Calling LLM with function tools")
-    response = llm_client.chat_completion(full_messages, tools=tools)
+    response = await llm_client.chat_completion(full_messages, tools=tools)
     
     # Process response
     assistant_message = response.choices[0].message
     tool_calls = llm_client.extract_tool_calls(response)
     
     # Handle function calls - loop until we get a text response
+    assistant_content = None
     max_iterations = 5  # Prevent infinite loops
     iteration = 0
-    
+
     while tool_calls and iteration < max_iterations:
         iteration += 1
-        logger.info(f"[conversation.py.handle_conversation] Processing {len(tool_calls)} tool calls (iteration {iteration})")
+        logger.info("[conversation.py.handle_conversation] Processing %s tool calls (iteration %s)", len(tool_calls), iteration)
         
-        for tool_call in tool_calls:
-            func_name = tool_call["function"]
-            func_args = json.loads(tool_call["arguments"])
-            logger.debug(f"[conversation.py.handle_conversation] Executing function: {func_name} with args: {func_args}")
-            
-            result = await execute_function(
-                func_name,
-                func_args,
+        # Execute independent tool calls concurrently
+        outcomes = await asyncio.gather(*[
+            execute_function(
+                tool_call["function"],
+                orjson.loads(tool_call["arguments"]),
                 conversation_id,
                 conversation_manager
             )
-            logger.debug(f"[conversation.py.handle_conversation] Function {func_name} result: {result}")
-            
+            for tool_call in tool_calls
+        ])
+
+        canned_replies = []
+        for tool_call, (result, canned_reply) in zip(tool_calls, outcomes):
+            logger.debug("[conversation.py.handle_conversation] Function %s result: %s", tool_call['function'], result)
+
             # Add function result to messages for next LLM call
-            full_messages.append({
-                "role": "assistant",
-                "content": None,
-                "tool_calls": [
-                    {
-                        "id": tool_call["id"],
-                        "type": "function",
-                        "function": {
-                            "name": func_name,
-                            "arguments": tool_call["arguments"]
-                        }
-                    }
-                ]
-            })
-            full_messages.append({
-                "role": "tool",
-                "tool_call_id": tool_call["id"],
-                "content": json.dumps(result)
-            })
-        
+            full_messages.extend(_build_tool_messages(tool_call, result))
+            if canned_reply:
+                canned_replies.append(canned_reply)
+
+        # If every tool result fully determines the user-facing reply
+        # (booking confirmed, nothing available, no matching provider),
+        # skip the second LLM round-trip entirely
+        if canned_replies and len(canned_replies) == len(tool_calls):
+            logger.info("[conversation.py.handle_conversation] All tool results terminal, skipping follow-up LLM call")
+            assistant_content = "\n".join(canned_replies)
+            break
+
         # Get response after function execution
-        logger.debug(f"[conversation.py.handle_conversation] Getting LLM response after function execution (iteration {iteration})")
-        response = llm_client.chat_completion(full_messages, tools=tools)
+        logger.debug("[conversation.py.handle_conversation] Getting LLM response after function execution (iteration %s)", iteration)
+        response = await llm_client.chat_completion(full_messages, tools=tools)
         tool_calls = llm_client.extract_tool_calls(response)
-        
+
         # If there are no more tool calls, extract the message
         if not tool_calls:
             assistant_content = llm_client.extract_message_content(response)
             break
-    
-    # Handle case where we hit max iterations
-    if iteration >= max_iterations:
-        logger.warning("[conversation.py.handle_conversation] Hit max iterations for tool calls")
-        assistant_content = "I've processed your request. How can I help you further?"
-    elif not tool_calls:
-        # No tool calls from the start
-        logger.debug("[conversation.py.handle_conversation] No tool calls, using direct response")
-        assistant_content = llm_client.extract_message_content(response)
+
+    # A canned reply or post-tool extraction already set the content above;
+    # only fill it in for the remaining exits
+    if assistant_content is None:
+        if tool_calls:
+            # Still asking for tools after max_iterations rounds
+            logger.warning("[conversation.py.handle_conversation] Hit max iterations for tool calls")
+            assistant_content = "I've processed your request. How can I help you further?"
+        else:
+            # No tool calls from the start
+            logger.debug("[conversation.py.handle_conversation] No tool calls, using direct response")
+            assistant_content = llm_client.extract_message_content(response)
     
     # Handle empty content
     if not assistant_content or assistant_content.strip() == "":
@@ -151,12 +174,12 @@ async def handle_conversation(request: ConversationRequest):
         assistant_content = "I've processed your request. How else can I help you?"
     
     # Add assistant message
-    conversation_manager.add_message(conversation_id, "assistant", assistant_content)
-    logger.debug(f"[conversation.py.handle_conversation] Added assistant message to conversation: {conversation_id}")
-    
+    await conversation_manager.add_message(conversation_id, "assistant", assistant_content)
+    logger.debug("[conversation.py.handle_conversation] Added assistant message to conversation: %s", conversation_id)
+
     # Get current state
-    current_state = conversation_manager.get_state(conversation_id)
-    logger.info(f"[conversation.py.handle_conversation] Conversation {conversation_id} state: {current_state}")
+    current_state = await conversation_manager.get_state(conversation_id)
+    logger.info("[conversation.py.handle_conversation] Conversation %s state: %s", conversation_id, current_state)
     
     return ConversationResponse(
         response=assistant_content,
@@ -166,60 +189,257 @@ async def handle_conversation(request: ConversationRequest):
     )
 
 
+def _sse_event(data: dict) -> str:
+    """Serialize one dictionary as a server-sent event."""
+    return f"data: {orjson.dumps(data).decode()}\n\n"
+
+
+@router.post("/stream")
+async def handle_conversation_stream(request: ConversationRequest):
+    """
+    Handle a conversation turn, streaming the assistant reply as server-sent
+    events.
+
+    Follows the same tool-calling flow as handle_conversation, but forwards
+    completion deltas to the client as they arrive so speech synthesis can
+    start before the full reply is generated. Events are JSON objects:
+    {"type": "delta", "content": ...} for each text fragment, then a final
+    {"type": "done", ...} carrying the conversation ID, state and suggested
+    actions.
+
+    Args:
+        request: User message and optional conversation ID
+
+    Returns:
+        StreamingResponse emitting text/event-stream
+    """
+    logger.info("[conversation.py.handle_conversation_stream] Received message for conversation: %s", request.conversation_id)
+
+    if not llm_client:
+        logger.error("[conversation.py.handle_conversation_stream] LLM client not configured")
+        raise HTTPException(
+            status_code=500,
+            detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
+        )
+
+    # Get or create conversation
+    conversation_id = request.conversation_id
+    if not conversation_id:
+        conversation_id = await conversation_manager.create_conversation()
+        logger.info("[conversation.py.handle_conversation_stream] Created new conversation: %s", conversation_id)
+
+    # Add user message
+    await conversation_manager.add_message(conversation_id, "user", request.message)
+
+    messages = await conversation_manager.get_messages_for_llm(conversation_id)
+    dynamic_prompt = await conversation_manager.get_dynamic_system_prompt(conversation_id)
+
+    full_messages = [
+        _STATIC_SYSTEM_MESSAGE,
+        {"role": "system", "content": dynamic_prompt},
+        *messages
+    ]
+
+    async def event_stream():
+        assistant_content = None
+        max_iterations = 5  # Prevent infinite loops
+        iteration = 0
+
+        while iteration < max_iterations:
+            # Stream each completion; text deltas are forwarded immediately,
+            # tool-call deltas are accumulated and executed like in the
+            # non-streaming endpoint
+            stream = await llm_client.chat_completion_stream(full_messages, tools=_TOOLS)
+            content_parts = []
+            pending_tool_calls = {}
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta is None:
+                    continue
+                if delta.tool_calls:
+                    for tc_delta in delta.tool_calls:
+                        partial = pending_tool_calls.setdefault(
+                            tc_delta.index,
+                            {"id": "", "function": "", "arguments": []}
+                        )
+                        if tc_delta.id:
+                            partial["id"] = tc_delta.id
+                        if tc_delta.function:
+                            if tc_delta.function.name:
+                                partial["function"] = tc_delta.function.name
+                            if tc_delta.function.arguments:
+                                partial["arguments"].append(tc_delta.function.arguments)
+                elif delta.content:
+                    content_parts.append(delta.content)
+                    yield _sse_event({"type": "delta", "content": delta.content})
+
+            if not pending_tool_calls:
+                assistant_content = "".join(content_parts)
+                break
+
+            iteration += 1
+            tool_calls = [
+                {
+                    "id": partial["id"],
+                    "function": partial["function"],
+                    "arguments": "".join(partial["arguments"])
+                }
+                for _, partial in sorted(pending_tool_calls.items())
+            ]
+            logger.info("[conversation.py.handle_conversation_stream] Processing %d tool calls (iteration %d)", len(tool_calls), iteration)
+
+            outcomes = await asyncio.gather(*[
+                execute_function(
+                    tool_call["function"],
+                    orjson.loads(tool_call["arguments"]),
+                    conversation_id,
+                    conversation_manager
+                )
+                for tool_call in tool_calls
+            ])
+
+            canned_replies = []
+            for tool_call, (result, canned_reply) in zip(tool_calls, outcomes):
+                full_messages.extend(_build_tool_messages(tool_call, result))
+                if canned_reply:
+                    canned_replies.append(canned_reply)
+
+            # Same short-circuit as the non-streaming endpoint: terminal tool
+            # results are emitted directly without another LLM round-trip
+            if canned_replies and len(canned_replies) == len(tool_calls):
+                logger.info("[conversation.py.handle_conversation_stream] All tool results terminal, skipping follow-up LLM call")
+                assistant_content = "\n".join(canned_replies)
+                yield _sse_event({"type": "delta", "content": assistant_content})
+                break
+
+        if assistant_content is None:
+            logger.warning("[conversation.py.handle_conversation_stream] Hit max iterations for tool calls")
+            assistant_content = "I've processed your request. How can I help you further?"
+            yield _sse_event({"type": "delta", "content": assistant_content})
+        elif not assistant_content.strip():
+            logger.warning("[conversation.py.handle_conversation_stream] Empty response after processing")
+            assistant_content = "I've processed your request. How else can I help you?"
+            yield _sse_event({"type": "delta", "content": assistant_content})
+
+        await conversation_manager.add_message(conversation_id, "assistant", assistant_content)
+        current_state = await conversation_manager.get_state(conversation_id)
+        logger.info("[conversation.py.handle_conversation_stream] Conversation %s state: %s", conversation_id, current_state)
+
+        yield _sse_event({
+            "type": "done",
+            "conversation_id": conversation_id,
+            "state": current_state,
+            "suggested_actions": get_suggested_actions(current_state)
+        })
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+def _build_tool_messages(tool_call: dict, result: dict) -> tuple:
+    """
+    Build the message pair recording one executed tool call.
+
+    Args:
+        tool_call: Extracted tool call (id, function, arguments)
+        result: Function result dictionary
+
+    Returns:
+        Tuple of (assistant tool-call echo, tool result message)
+    """
+    return (
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": tool_call["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tool_call["function"],
+                        "arguments": tool_call["arguments"]
+                    }
+                }
+            ]
+        },
+        {
+            "role": "tool",
+            "tool_call_id": tool_call["id"],
+            "content": orjson.dumps(result).decode()
+        }
+    )
+
+
+# Deterministic confirmation for successful bookings; phrased for voice output
+_CONFIRMATION_TEMPLATE = (
+    "Your appointment is confirmed, {patient_name}. You're seeing {provider_name} "
+    "on {date} at {time} at {location}. Your confirmation ID is {appointment_id}."
+)
+
+
 async def execute_function(
     function_name: str,
     arguments: dict,
     conversation_id: str,
     conv_manager: ConversationManager
-) -> dict:
+) -> tuple:
     """
     Execute a function call from the LLM.
-    
+
     Args:
         function_name: Name of the function to execute
         arguments: Function arguments
         conversation_id: Current conversation ID
         conv_manager: Conversation manager instance
-        
+
     Returns:
-        Function result as dictionary
+        Tuple of (result dictionary, optional canned user-facing reply).
+        The canned reply is set when the result fully determines what the
+        user should hear, letting the caller skip the follow-up LLM call.
     """
-    logger.info(f"[conversation.py.execute_function] Executing function: {function_name} for conversation: {conversation_id}")
-    logger.debug(f"[conversation.py.execute_function] Function arguments: {arguments}")
+    logger.info("[conversation.py.execute_function] Executing function: %s for conversation: %s", function_name, conversation_id)
+    logger.debug("[conversation.py.execute_function] Function arguments: %s", arguments)
     
     if function_name == "identify_provider":
         health_issue = arguments.get("health_issue")
         patient_name = arguments.get("patient_name")
         
-        logger.info(f"[conversation.py.execute_function] Identifying provider for health issue: {health_issue}")
+        logger.info("[conversation.py.execute_function] Identifying provider for health issue: %s", health_issue)
         
         # Match provider
         match = match_provider_for_issue(health_issue)
         
         if not match:
-            logger.warning(f"[conversation.py.execute_function] No suitable provider found for issue: {health_issue}")
-            return {
+            logger.warning("[conversation.py.execute_function] No suitable provider found for issue: %s", health_issue)
+            result = {
                 "error": "No suitable provider found",
                 "message": f"I apologize, but we don't currently have specialists available for '{health_issue}'. Our available specialties include: General Practitioner, Dermatologist, Cardiologist, Neurologist, Orthopedist, Pediatrician, Psychiatrist, Ophthalmologist, ENT Specialist, and Dentist. Would you like to see a General Practitioner who can help with most health concerns?",
                 "available_specialties": ["General Practitioner", "Dermatologist", "Cardiologist", "Neurologist", "Orthopedist", "Pediatrician", "Psychiatrist", "Ophthalmologist", "ENT Specialist", "Dentist"]
             }
+            return result, result["message"]
         
-        logger.info(f"[conversation.py.execute_function] Provider matched: {match.provider_name} (ID: {match.provider_id})")
+        logger.info("[conversation.py.execute_function] Provider matched: %s (ID: %s)", match.provider_name, match.provider_id)
         
         # Update conversation context
-        conv_manager.update_context(conversation_id, "health_issue", health_issue)
-        conv_manager.update_context(conversation_id, "provider_id", match.provider_id)
-        conv_manager.update_context(conversation_id, "provider_name", match.provider_name)
+        await conv_manager.update_context(conversation_id, "health_issue", health_issue)
+        await conv_manager.update_context(conversation_id, "provider_id", match.provider_id)
+        await conv_manager.update_context(conversation_id, "provider_name", match.provider_name)
         if patient_name:
-            conv_manager.update_context(conversation_id, "patient_name", patient_name)
-            logger.debug(f"[conversation.py.execute_function] Updated patient name: {patient_name}")
-        
-        conv_manager.set_state(conversation_id, ConversationState.PROVIDER_MATCHED)
-        logger.debug(f"[conversation.py.execute_function] Conversation state updated to: {ConversationState.PROVIDER_MATCHED}")
+            await conv_manager.update_context(conversation_id, "patient_name", patient_name)
+            logger.debug("[conversation.py.execute_function] Updated patient name: %s", patient_name)
+
+        await conv_manager.set_state(conversation_id, ConversationState.PROVIDER_MATCHED)
+        logger.debug("[conversation.py.execute_function] Conversation state updated to: %s", ConversationState.PROVIDER_MATCHED)
         
+        # The next turn almost always asks for availability; start the lookup
+        # now so it overlaps with the LLM generating its response
+        _warm_availability(match.provider_id)
+
         # Get provider details
         provider = get_provider_by_id(match.provider_id)
-        
+
         return {
             "provider_id": match.provider_id,
             "provider_name": match.provider_name,
@@ -228,60 +448,50 @@ async def execute_function(
             "rating": provider.rating,
             "location": provider.location,
             "match_reason": match.match_reason
-        }
+        }, None
     
     elif function_name == "check_availability":
         provider_id = arguments.get("provider_id")
         num_days = arguments.get("num_days", 7)
         time_preference = arguments.get("time_preference", "any")
         
-        logger.info(f"[conversation.py.execute_function] Checking availability for provider: {provider_id}, days: {num_days}, time_preference: {time_preference}")
+        logger.info("[conversation.py.execute_function] Checking availability for provider: %s, days: %s, time_preference: %s", provider_id, num_days, time_preference)
         
-        # Get availability
-        availability = get_availability_summary(provider_id, num_days)
+        # Get availability (coalesced with any concurrent identical lookup)
+        availability = await _check_availability_coalesced(provider_id, num_days)
         
         # Filter by time preference if specified
         if time_preference and time_preference != "any":
-            filtered_availability = {}
-            for date, slots in availability.items():
-                filtered_slots = []
-                for slot in slots:
-                    hour = int(slot.split(":")[0])
-                    if time_preference == "morning" and hour < 12:
-                        filtered_slots.append(slot)
-                    elif time_preference == "afternoon" and hour >= 12:
-                        filtered_slots.append(slot)
-                
-                if filtered_slots:
-                    filtered_availability[date] = filtered_slots
-            
-            availability = filtered_availability
-            logger.debug(f"[conversation.py.execute_function] Filtered to {len(availability)} dates with {time_preference} slots")
+            availability = _filter_by_time_preference(availability, time_preference)
+            logger.debug("[conversation.py.execute_function] Filtered to %s dates with %s slots", len(availability), time_preference)
         
         if not availability:
-            logger.warning(f"[conversation.py.execute_function] No available slots found for provider: {provider_id}")
+            logger.warning("[conversation.py.execute_function] No available slots found for provider: %s", provider_id)
             provider = get_provider_by_id(provider_id)
             provider_name = provider.name if provider else "this provider"
             
             time_msg = f" in the {time_preference}" if time_preference != "any" else ""
-            return {
+            result = {
                 "error": "No available slots found",
                 "message": f"I apologize, but {provider_name} doesn't have any available appointment slots{time_msg} in the next {num_days} days. Would you like me to check availability for a different time period, or would you prefer to see another provider with the same specialty?",
                 "provider_id": provider_id
             }
+            return result, result["message"]
         
-        logger.info(f"[conversation.py.execute_function] Found availability for {len(availability)} dates")
+        logger.info("[conversation.py.execute_function] Found availability for %s dates", len(availability))
         
         # Update conversation state
-        conv_manager.update_context(conversation_id, "availability", availability)
-        conv_manager.set_state(conversation_id, ConversationState.AVAILABILITY_CHECKED)
-        logger.debug(f"[conversation.py.execute_function] Conversation state updated to: {ConversationState.AVAILABILITY_CHECKED}")
+        await conv_manager.update_context(conversation_id, "availability", availability)
+        await conv_manager.set_state(conversation_id, ConversationState.AVAILABILITY_CHECKED)
+        logger.debug("[conversation.py.execute_function] Conversation state updated to: %s", ConversationState.AVAILABILITY_CHECKED)
         
+        # Availability still goes through the LLM so the times are phrased
+        # naturally for voice output
         return {
             "provider_id": provider_id,
             "availability": availability,
             "formatted_message": format_availability_message(availability)
-        }
+        }, None
     
     elif function_name == "create_appointment":
         patient_name = arguments.get("patient_name")
@@ -290,7 +500,7 @@ async def execute_function(
         time = arguments.get("time")
         reason = arguments.get("reason")
         
-        logger.info(f"[conversation.py.execute_function] Creating appointment for patient: {patient_name}, provider: {provider_id}, date: {date}, time: {time}")
+        logger.info("[conversation.py.execute_function] Creating appointment for patient: %s, provider: %s, date: %s, time: %s", patient_name, provider_id, date, time)
         
         # Create appointment
         appointment_data = AppointmentCreate(
@@ -301,20 +511,22 @@ async def execute_function(
             reason=reason
         )
         
-        appointment = create_appointment(appointment_data)
+        # Booking the slot persists the schedule CSV to disk, so run it in the
+        # threadpool instead of blocking the event loop.
+        appointment = await run_in_threadpool(create_appointment, appointment_data)
         
         if not appointment:
-            logger.error(f"[conversation.py.execute_function] Failed to create appointment for provider: {provider_id} at {date} {time}")
-            return {"error": "Failed to create appointment. Slot may no longer be available."}
+            logger.error("[conversation.py.execute_function] Failed to create appointment for provider: %s at %s %s", provider_id, date, time)
+            return {"error": "Failed to create appointment. Slot may no longer be available."}, None
         
-        logger.info(f"[conversation.py.execute_function] Appointment created successfully: {appointment.id}")
+        logger.info("[conversation.py.execute_function] Appointment created successfully: %s", appointment.id)
         
         # Update conversation state
-        conv_manager.update_context(conversation_id, "appointment_id", appointment.id)
-        conv_manager.set_state(conversation_id, ConversationState.APPOINTMENT_CONFIRMED)
-        logger.debug(f"[conversation.py.execute_function] Conversation state updated to: {ConversationState.APPOINTMENT_CONFIRMED}")
+        await conv_manager.update_context(conversation_id, "appointment_id", appointment.id)
+        await conv_manager.set_state(conversation_id, ConversationState.APPOINTMENT_CONFIRMED)
+        logger.debug("[conversation.py.execute_function] Conversation state updated to: %s", ConversationState.APPOINTMENT_CONFIRMED)
         
-        return {
+        result = {
             "success": True,
             "appointment_id": appointment.id,
             "patient_name": appointment.patient_name,
@@ -323,21 +535,136 @@ async def execute_function(
             "time": appointment.time,
             "location": appointment.location
         }
-    
-    logger.error(f"[conversation.py.execute_function] Unknown function: {function_name}")
-    return {"error": f"Unknown function: {function_name}"}
+        # The confirmation is fully determined by the booking details, so no
+        # second LLM call is needed to phrase it
+        return result, _CONFIRMATION_TEMPLATE.format(**result)
+
+    logger.error("[conversation.py.execute_function] Unknown function: %s", function_name)
+    return {"error": f"Unknown function: {function_name}"}, None
+
+
+# Slot strings are zero-padded "HH:MM", so a lexicographic compare against
+# noon classifies morning vs afternoon without parsing hours out of every
+# slot on each request
+_NOON = "12:00"
+
+
+def _filter_by_time_preference(availability: dict, time_preference: str) -> dict:
+    """
+    Keep only the slots matching a morning/afternoon preference.
+
+    Args:
+        availability: Dictionary mapping dates to available time slots
+        time_preference: "morning" (before 12 PM) or "afternoon" (12 PM or later)
+
+    Returns:
+        Filtered availability dictionary; dates with no matching slots are dropped
+    """
+    filtered = {}
+    for date, slots in availability.items():
+        if time_preference == "morning":
+            kept = [slot for slot in slots if slot < _NOON]
+        else:
+            kept = [slot for slot in slots if slot >= _NOON]
+        if kept:
+            filtered[date] = kept
+    return filtered
+
+
+# In-flight availability lookups keyed by (provider_id, num_days). Concurrent
+# conversations asking for the same provider/window share one computation
+# instead of each running their own.
+_availability_inflight = {}
+
+# Completed availability summaries keyed by (provider_id, num_days). Entries
+# are dropped whenever the schedule database changes (a booking or a reload),
+# so the cache never serves a slot that was just taken. Populated both by
+# regular lookups and by the speculative warm-up after provider matching.
+_availability_cache = {}
+register_schedule_listener(_availability_cache.clear)
+
+
+async def _check_availability_coalesced(provider_id: str, num_days: int):
+    """
+    Get an availability summary, coalescing concurrent identical lookups.
+
+    Results are cached until the next schedule change, so a lookup warmed
+    speculatively (or made by another conversation) is served from memory.
+
+    Args:
+        provider_id: Provider ID
+        num_days: Number of days to look ahead
+
+    Returns:
+        Dictionary mapping dates to available time slots
+    """
+    key = (provider_id, num_days)
+    cached = _availability_cache.get(key)
+    if cached is not None:
+        logger.debug("[conversation.py._check_availability_coalesced] Serving cached availability for %s", key)
+        return cached
+
+    inflight = _availability_inflight.get(key)
+    if inflight is not None:
+        logger.debug("[conversation.py._check_availability_coalesced] Joining in-flight lookup for %s", key)
+        return await inflight
+
+    future = asyncio.get_running_loop().create_future()
+    _availability_inflight[key] = future
+    try:
+        result = await run_in_threadpool(get_availability_summary, provider_id, num_days)
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        _availability_cache[key] = result
+        return result
+    finally:
+        _availability_inflight.pop(key, None)
+
+
+# Strong references to in-flight warm-up tasks. The event loop only keeps
+# weak references to tasks, so without this a warm-up could be garbage
+# collected before it finishes; the done callback drops the reference once
+# the task completes (which also marks its exception, if any, as retrieved).
+_warmup_tasks = set()
+
+
+def _warm_availability(provider_id: str) -> None:
+    """
+    Speculatively warm the availability cache for a just-matched provider.
+
+    Provider matching is almost always followed by a check_availability tool
+    call on the next LLM turn, so the lookup is started in the background
+    while the model is still generating; the eventual tool call is then
+    served from the cache. Failures are logged and otherwise ignored — the
+    real lookup will simply run on demand.
+
+    Args:
+        provider_id: Provider ID to prefetch availability for
+    """
+    async def _warm():
+        try:
+            await _check_availability_coalesced(provider_id, 7)
+        except Exception as e:
+            logger.debug("[conversation.py._warm_availability] Speculative lookup failed for %s: %s", provider_id, e)
+
+    task = asyncio.create_task(_warm())
+    _warmup_tasks.add(task)
+    task.add_done_callback(_warmup_tasks.discard)
+
+
+# Suggested actions per conversation state, built once at import
+_SUGGESTED_ACTIONS = {
+    ConversationState.INITIAL: ["Describe your health issue", "Ask about providers"],
+    ConversationState.PROVIDER_MATCHED: ["Check availability", "Ask about the provider"],
+    ConversationState.AVAILABILITY_CHECKED: ["Book an appointment", "Request different times"],
+    ConversationState.APPOINTMENT_CONFIRMED: ["Download .ics file", "Schedule another appointment"],
+}
 
 
 def get_suggested_actions(state: str) -> list:
     """Get suggested actions based on conversation state."""
-    logger.debug(f"[conversation.py.get_suggested_actions] Getting suggested actions for state: {state}")
-    
-    if state == ConversationState.INITIAL:
-        return ["Describe your health issue", "Ask about providers"]
-    elif state == ConversationState.PROVIDER_MATCHED:
-        return ["Check availability", "Ask about the provider"]
-    elif state == ConversationState.AVAILABILITY_CHECKED:
-        return ["Book an appointment", "Request different times"]
-    elif state == ConversationState.APPOINTMENT_CONFIRMED:
-        return ["Download .ics file", "Schedule another appointment"]
-    return []
+    logger.debug("[conversation.py.get_suggested_actions] Getting suggested actions for state: %s", state)
+    return _SUGGESTED_ACTIONS.get(state, [])
@@ -25,7 +25,11 @@ class Config:
         self.APP_NAME = "Appointment Scheduler API"
         self.APP_VERSION = "1.0.0"
         self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
-        
+
+        # Logging level name, validated by main.py; DEBUG emits per-request
+        # formatting and I/O on every hot path, so production defaults to INFO
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
         logger.info(f"[config.py.Config.__init__] Configuration loaded - Model: {self.OPENAI_MODEL}, Debug: {self.DEBUG}")
         
         if not self.OPENAI_API_KEY:
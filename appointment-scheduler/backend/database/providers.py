@@ -4,8 +4,10 @@ Loads provider data from CSV file on startup and maintains it in-memory for fast
 """
 import logging
 import csv
+import os
+import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from backend.models.schemas import Provider
 
 logger = logging.getLogger(__name__)
@@ -13,47 +15,99 @@ logger = logging.getLogger(__name__)
 # In-memory provider database (loaded from CSV)
 PROVIDERS_DB: List[Provider] = []
 
-# Path to the CSV file
-CSV_FILE = Path(__file__).parent / "providers.csv"
+# Lookup indexes built alongside PROVIDERS_DB so the hot getters are O(1)
+# instead of scanning the list per call
+_PROVIDERS_BY_ID: Dict[str, Provider] = {}
+_PROVIDERS_BY_SPECIALTY: Dict[str, List[Provider]] = {}
+_BEST_BY_SPECIALTY: Dict[str, Provider] = {}
 
+# Path to the CSV file; PROVIDERS_CSV lets tests and deployments point at
+# an alternative dataset without touching the bundled one
+CSV_FILE = Path(os.getenv("PROVIDERS_CSV", Path(__file__).parent / "providers.csv"))
 
-def load_providers_from_csv() -> List[Provider]:
+# Callbacks invoked whenever the provider database is (re)initialized, so
+# higher-level caches keyed on provider data can invalidate themselves
+# without this module needing to know about them
+_change_listeners = []
+
+
+def register_change_listener(callback):
+    """
+    Register a callback to be invoked whenever provider data is reloaded.
+
+    Args:
+        callback: Zero-argument callable (e.g. a cache_clear function)
+    """
+    _change_listeners.append(callback)
+
+
+def _notify_change_listeners():
+    """Invoke all registered change listeners."""
+    for callback in _change_listeners:
+        callback()
+
+
+def load_providers_from_csv(validate: bool = False) -> List[Provider]:
     """
     Load providers from CSV file.
-    
+
+    The CSV ships with the application and is trusted, so rows are built
+    with Provider.model_construct by default to skip per-row Pydantic
+    validation; the explicit int/float casts below surface malformed rows.
+
+    Args:
+        validate: Run full Pydantic validation per row instead
+
     Returns:
         List of Provider objects
     """
     providers = []
-    
+    build = Provider if validate else Provider.model_construct
+
     try:
         with open(CSV_FILE, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                provider = Provider(
+                provider = build(
                     id=row['id'],
                     name=row['name'],
-                    specialty=row['specialty'],
+                    # Interned so the hot specialty equality checks in the
+                    # indexes compare by pointer
+                    specialty=sys.intern(row['specialty']),
                     experience_years=int(row['experience_years']),
                     rating=float(row['rating']),
                     location=row['location']
                 )
                 providers.append(provider)
         
-        logger.info(f"[providers.py.load_providers_from_csv] Loaded {len(providers)} providers from CSV")
+        logger.info("[providers.py.load_providers_from_csv] Loaded %s providers from CSV", len(providers))
     except FileNotFoundError:
-        logger.error(f"[providers.py.load_providers_from_csv] CSV file not found: {CSV_FILE}")
+        logger.error("[providers.py.load_providers_from_csv] CSV file not found: %s", CSV_FILE)
     except Exception as e:
-        logger.error(f"[providers.py.load_providers_from_csv] Error loading CSV: {e}")
+        logger.error("[providers.py.load_providers_from_csv] Error loading CSV: %s", e)
     
     return providers
 
 
 def initialize_database():
-    """Initialize the provider database by loading from CSV."""
+    """Initialize the provider database and its indexes by loading from CSV."""
     global PROVIDERS_DB
     PROVIDERS_DB = load_providers_from_csv()
-    logger.info(f"[providers.py.initialize_database] Database initialized with {len(PROVIDERS_DB)} providers")
+
+    _PROVIDERS_BY_ID.clear()
+    _PROVIDERS_BY_SPECIALTY.clear()
+    _BEST_BY_SPECIALTY.clear()
+    for provider in PROVIDERS_DB:
+        _PROVIDERS_BY_ID[provider.id] = provider
+        _PROVIDERS_BY_SPECIALTY.setdefault(provider.specialty, []).append(provider)
+    # Keep each specialty list pre-sorted best-first so ranked queries are a
+    # slice instead of a per-call sort; the best provider is then the head
+    for specialty, providers in _PROVIDERS_BY_SPECIALTY.items():
+        providers.sort(key=lambda p: (p.rating, p.experience_years), reverse=True)
+        _BEST_BY_SPECIALTY[specialty] = providers[0]
+    _notify_change_listeners()
+
+    logger.info("[providers.py.initialize_database] Database initialized with %s providers (%s specialties)", len(PROVIDERS_DB), len(_PROVIDERS_BY_SPECIALTY))
 
 
 # Initialize on module load
@@ -62,43 +116,39 @@ initialize_database()
 
 def get_all_providers() -> List[Provider]:
     """Get all providers."""
-    logger.debug(f"[providers.py.get_all_providers] Retrieving all providers (count: {len(PROVIDERS_DB)})")
+    logger.debug("[providers.py.get_all_providers] Retrieving all providers (count: %s)", len(PROVIDERS_DB))
     return PROVIDERS_DB
 
 
 def get_provider_by_id(provider_id: str) -> Optional[Provider]:
     """Get a provider by ID."""
-    logger.debug(f"[providers.py.get_provider_by_id] Looking up provider: {provider_id}")
-    
-    for provider in PROVIDERS_DB:
-        if provider.id == provider_id:
-            logger.debug(f"[providers.py.get_provider_by_id] Provider found: {provider.name}")
-            return provider
-    
-    logger.warning(f"[providers.py.get_provider_by_id] Provider not found: {provider_id}")
-    return None
+    logger.debug("[providers.py.get_provider_by_id] Looking up provider: %s", provider_id)
+
+    provider = _PROVIDERS_BY_ID.get(provider_id)
+    if provider is None:
+        logger.warning("[providers.py.get_provider_by_id] Provider not found: %s", provider_id)
+    return provider
 
 
 def get_providers_by_specialty(specialty: str) -> List[Provider]:
     """Get providers by specialty."""
-    logger.debug(f"[providers.py.get_providers_by_specialty] Searching for providers with specialty: {specialty}")
-    
-    providers = [p for p in PROVIDERS_DB if p.specialty == specialty]
-    logger.debug(f"[providers.py.get_providers_by_specialty] Found {len(providers)} providers with specialty: {specialty}")
-    
+    logger.debug("[providers.py.get_providers_by_specialty] Searching for providers with specialty: %s", specialty)
+
+    # Return a copy so callers can sort/filter without disturbing the index
+    providers = list(_PROVIDERS_BY_SPECIALTY.get(specialty, ()))
+    logger.debug("[providers.py.get_providers_by_specialty] Found %s providers with specialty: %s", len(providers), specialty)
+
     return providers
 
 
 def get_best_provider_for_specialty(specialty: str) -> Optional[Provider]:
     """Get the best-rated provider for a specialty."""
-    logger.debug(f"[providers.py.get_best_provider_for_specialty] Finding best provider for specialty: {specialty}")
-    
-    providers = get_providers_by_specialty(specialty)
-    if not providers:
-        logger.warning(f"[providers.py.get_best_provider_for_specialty] No providers found for specialty: {specialty}")
+    logger.debug("[providers.py.get_best_provider_for_specialty] Finding best provider for specialty: %s", specialty)
+
+    best_provider = _BEST_BY_SPECIALTY.get(specialty)
+    if best_provider is None:
+        logger.warning("[providers.py.get_best_provider_for_specialty] No providers found for specialty: %s", specialty)
         return None
-    
-    best_provider = max(providers, key=lambda p: (p.rating, p.experience_years))
-    logger.info(f"[providers.py.get_best_provider_for_specialty] Best provider for {specialty}: {best_provider.name} (rating: {best_provider.rating})")
-    
+
+    logger.debug("[providers.py.get_best_provider_for_specialty] Best provider for %s: %s (rating: %s)", specialty, best_provider.name, best_provider.rating)
     return best_provider
@@ -2,8 +2,15 @@
 CSV-based schedule database.
 Loads schedule data from CSV file on startup and maintains it in-memory for fast queries.
 """
+import atexit
 import logging
 import csv
+import io
+import os
+import queue
+import threading
+import time as time_module
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict
 from backend.models.schemas import Schedule
@@ -11,59 +18,164 @@ from backend.models.schemas import Schedule
 logger = logging.getLogger(__name__)
 
 # In-memory schedule database (loaded from CSV)
-# Structure: {provider_id: [Schedule, Schedule, ...]}
-SCHEDULES_DB: Dict[str, List[Schedule]] = {}
+# Structure: {provider_id: {date: Schedule}} so provider/date lookups are
+# O(1) hash probes instead of list scans
+SCHEDULES_DB: Dict[str, Dict[str, Schedule]] = {}
 
-# Path to the CSV file
-CSV_FILE = Path(__file__).parent / "schedules.csv"
+# Path to the CSV file; SCHEDULES_CSV lets tests and deployments point at
+# an alternative dataset so bookings (which compaction persists back to this
+# file) don't consume slots from the bundled one
+CSV_FILE = Path(os.getenv("SCHEDULES_CSV", Path(__file__).parent / "schedules.csv"))
 
+# Append-only booking log (write-ahead log). Each booking appends one line
+# here instead of rewriting the whole CSV; the log is folded back into
+# schedules.csv by compact_bookings() and replayed over the CSV on startup,
+# so no booking is lost on crash.
+BOOKING_LOG = CSV_FILE.parent / "bookings.log"
 
-def load_schedules_from_csv() -> Dict[str, List[Schedule]]:
+# Fold the log into the CSV after this many bookings
+_COMPACT_EVERY = 100
+_bookings_since_compact = 0
+
+# Booking-log lines waiting to be written. A daemon thread coalesces bursts
+# into one writelines() call per flush window instead of a write syscall per
+# booking; callers only pay a queue put.
+_FLUSH_WINDOW_SECONDS = 0.05
+_booking_queue: "queue.Queue[str]" = queue.Queue()
+_log_write_lock = threading.Lock()
+_flusher_started = False
+_flusher_start_lock = threading.Lock()
+
+# Per-provider booking locks: the membership check and removal in book_slot
+# must be atomic under concurrent requests or two callers could book the
+# same slot. Per-provider granularity lets bookings for different providers
+# proceed in parallel.
+_booking_locks: "defaultdict[str, threading.Lock]" = defaultdict(threading.Lock)
+
+# Per-provider list views of the nested schedule dict, built lazily by
+# get_provider_schedule. Bookings mutate the Schedule objects in place, so
+# the lists stay valid between reloads and only a reload clears them.
+_schedule_list_cache: Dict[str, List[Schedule]] = {}
+
+# Callbacks invoked whenever schedule data changes (slot booked or reload),
+# so higher-level caches can invalidate themselves without this module
+# needing to know about them
+_change_listeners = []
+
+
+def register_change_listener(callback):
+    """
+    Register a callback to be invoked whenever schedule data changes.
+
+    Args:
+        callback: Zero-argument callable (e.g. a cache_clear function)
+    """
+    _change_listeners.append(callback)
+
+
+def _notify_change_listeners():
+    """Invoke all registered change listeners."""
+    for callback in _change_listeners:
+        callback()
+
+
+def load_schedules_from_csv() -> Dict[str, Dict[str, Schedule]]:
     """
     Load schedules from CSV file.
     
     Returns:
-        Dictionary mapping provider_id to list of Schedule objects
+        Nested dictionary mapping provider_id to {date: Schedule}
     """
-    schedules_dict: Dict[str, List[Schedule]] = {}
-    
+    schedules_dict: Dict[str, Dict[str, Schedule]] = {}
+
+    # Column positions in schedules.csv; csv.reader avoids DictReader's
+    # dict-per-row construction on the startup path
+    col_provider_id, col_date, col_time_slots = 0, 1, 2
+
     try:
-        with open(CSV_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Parse time slots from comma-separated string
-                time_slots = [slot.strip() for slot in row['time_slots'].split(',')]
-                
-                schedule = Schedule(
-                    provider_id=row['provider_id'],
-                    date=row['date'],
-                    available_slots=time_slots
-                )
-                
-                # Group schedules by provider_id
-                if schedule.provider_id not in schedules_dict:
-                    schedules_dict[schedule.provider_id] = []
-                schedules_dict[schedule.provider_id].append(schedule)
-        
+        # Read the whole file in one call and parse from memory; the
+        # time_slots field is quoted, so csv.reader still does the splitting
+        text = CSV_FILE.read_text(encoding='utf-8')
+        reader = csv.reader(text.splitlines())
+        next(reader, None)  # skip header
+        for row in reader:
+            provider_id = row[col_provider_id]
+            date = row[col_date]
+            # Parse time slots from comma-separated string; rows with an
+            # empty slot field mean a fully booked day, not one "" slot.
+            # The field is written without whitespace by
+            # save_schedules_to_csv, so no per-slot strip is needed.
+            slots_field = row[col_time_slots]
+            time_slots = slots_field.split(',') if slots_field else []
+
+            # The bundled CSV is trusted input, so skip per-row Pydantic
+            # validation; every field is already the declared type
+            schedule = Schedule.model_construct(
+                provider_id=provider_id,
+                date=date,
+                available_slots=time_slots
+            )
+
+            # Index schedules by provider_id, then date
+            schedules_dict.setdefault(provider_id, {})[date] = schedule
+
+        # Sort once here so saves can rely on insertion order instead of
+        # re-sorting the whole database on every write
+        schedules_dict = {
+            provider_id: dict(sorted(dates.items()))
+            for provider_id, dates in sorted(schedules_dict.items())
+        }
+
         total_schedules = sum(len(schedules) for schedules in schedules_dict.values())
-        logger.info(f"[schedules.py.load_schedules_from_csv] Loaded {total_schedules} schedule entries for {len(schedules_dict)} providers")
+        logger.info("[schedules.py.load_schedules_from_csv] Loaded %s schedule entries for %s providers", total_schedules, len(schedules_dict))
     except FileNotFoundError:
-        logger.error(f"[schedules.py.load_schedules_from_csv] CSV file not found: {CSV_FILE}")
+        logger.error("[schedules.py.load_schedules_from_csv] CSV file not found: %s", CSV_FILE)
     except Exception as e:
-        logger.error(f"[schedules.py.load_schedules_from_csv] Error loading CSV: {e}")
+        logger.error("[schedules.py.load_schedules_from_csv] Error loading CSV: %s", e)
     
     return schedules_dict
 
 
+def _replay_booking_log():
+    """
+    Replay residual booking-log entries over the loaded schedules.
+
+    Entries are left over when the process stopped before the last
+    compaction; replaying them keeps bookings durable without the CSV
+    having been rewritten per booking.
+    """
+    if not BOOKING_LOG.exists():
+        return
+
+    replayed = 0
+    try:
+        with open(BOOKING_LOG, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                provider_id, date, time = line.split(',')[:3]
+                schedule = SCHEDULES_DB.get(provider_id, {}).get(date)
+                if schedule is not None and time in schedule.available_slots:
+                    schedule.available_slots.remove(time)
+                    replayed += 1
+    except Exception as e:
+        logger.error("[schedules.py._replay_booking_log] Error replaying booking log: %s", e)
+        return
+
+    if replayed:
+        logger.info("[schedules.py._replay_booking_log] Replayed %s logged bookings", replayed)
+        compact_bookings()
+
+
 def initialize_database():
     """Initialize the schedule database by loading from CSV."""
     global SCHEDULES_DB
     SCHEDULES_DB = load_schedules_from_csv()
-    logger.info(f"[schedules.py.initialize_database] Database initialized with schedules for {len(SCHEDULES_DB)} providers")
-
-
-# Initialize on module load
-initialize_database()
+    _schedule_list_cache.clear()
+    _replay_booking_log()
+    _notify_change_listeners()
+    logger.info("[schedules.py.initialize_database] Database initialized with schedules for %s providers", len(SCHEDULES_DB))
 
 
 def get_provider_schedule(provider_id: str, days_ahead: int = 14) -> List[Schedule]:
@@ -77,14 +189,17 @@ def get_provider_schedule(provider_id: str, days_ahead: int = 14) -> List[Schedu
     Returns:
         List of Schedule objects
     """
-    logger.debug(f"[schedules.py.get_provider_schedule] Getting schedule for provider: {provider_id}")
+    logger.debug("[schedules.py.get_provider_schedule] Getting schedule for provider: %s", provider_id)
     
     if provider_id in SCHEDULES_DB:
-        schedules = SCHEDULES_DB[provider_id]
-        logger.debug(f"[schedules.py.get_provider_schedule] Found {len(schedules)} schedule entries")
+        schedules = _schedule_list_cache.get(provider_id)
+        if schedules is None:
+            schedules = list(SCHEDULES_DB[provider_id].values())
+            _schedule_list_cache[provider_id] = schedules
+        logger.debug("[schedules.py.get_provider_schedule] Found %s schedule entries", len(schedules))
         return schedules
     
-    logger.warning(f"[schedules.py.get_provider_schedule] No schedules found for provider: {provider_id}")
+    logger.warning("[schedules.py.get_provider_schedule] No schedules found for provider: %s", provider_id)
     return []
 
 
@@ -99,15 +214,14 @@ def get_available_slots(provider_id: str, date: str) -> List[str]:
     Returns:
         List of available time slots
     """
-    logger.debug(f"[schedules.py.get_available_slots] Getting available slots for provider: {provider_id}, date: {date}")
+    logger.debug("[schedules.py.get_available_slots] Getting available slots for provider: %s, date: %s", provider_id, date)
     
-    schedules = get_provider_schedule(provider_id)
-    for schedule in schedules:
-        if schedule.date == date:
-            logger.debug(f"[schedules.py.get_available_slots] Found {len(schedule.available_slots)} slots for {date}")
-            return schedule.available_slots
+    schedule = SCHEDULES_DB.get(provider_id, {}).get(date)
+    if schedule is not None:
+        logger.debug("[schedules.py.get_available_slots] Found %s slots for %s", len(schedule.available_slots), date)
+        return schedule.available_slots
     
-    logger.debug(f"[schedules.py.get_available_slots] No slots found for provider: {provider_id}, date: {date}")
+    logger.debug("[schedules.py.get_available_slots] No slots found for provider: %s, date: %s", provider_id, date)
     return []
 
 
@@ -123,36 +237,144 @@ def book_slot(provider_id: str, date: str, time: str) -> bool:
     Returns:
         True if booking successful, False otherwise
     """
-    logger.info(f"[schedules.py.book_slot] Booking slot for provider: {provider_id}, date: {date}, time: {time}")
+    logger.info("[schedules.py.book_slot] Booking slot for provider: %s, date: %s, time: %s", provider_id, date, time)
     
     if provider_id not in SCHEDULES_DB:
-        logger.warning(f"[schedules.py.book_slot] Provider not found in database: {provider_id}")
+        logger.warning("[schedules.py.book_slot] Provider not found in database: %s", provider_id)
         return False
     
-    schedules = SCHEDULES_DB[provider_id]
-    for schedule in schedules:
-        if schedule.date == date and time in schedule.available_slots:
-            schedule.available_slots.remove(time)
-            logger.info(f"[schedules.py.book_slot] Slot booked successfully: {date} at {time}")
-            
-            # Automatically save to CSV to persist the booking
-            save_result = save_schedules_to_csv()
-            if save_result:
-                logger.info(f"[schedules.py.book_slot] Booking persisted to CSV")
-            else:
-                logger.warning(f"[schedules.py.book_slot] Failed to persist booking to CSV")
-            
-            return True
+    with _booking_locks[provider_id]:
+        schedule = SCHEDULES_DB[provider_id].get(date)
+        if schedule is not None:
+            # Single scan: remove() both tests membership and deletes, so no
+            # separate "time in slots" pass is needed
+            try:
+                schedule.available_slots.remove(time)
+            except ValueError:
+                schedule = None
+    if schedule is not None:
+        _notify_change_listeners()
+        logger.info("[schedules.py.book_slot] Slot booked successfully: %s at %s", date, time)
+        
+        # Persist via the append-only log; the full CSV is only rewritten
+        # at compaction instead of once per booking
+        _log_booking(provider_id, date, time)
+        return True
     
-    logger.warning(f"[schedules.py.book_slot] Failed to book slot - not available: {date} at {time}")
+    logger.warning("[schedules.py.book_slot] Failed to book slot - not available: %s at %s", date, time)
     return False
 
 
+def _log_booking(provider_id: str, date: str, time: str):
+    """Enqueue one booking for the background log flusher."""
+    _ensure_flusher_started()
+    _booking_queue.put(f"{provider_id},{date},{time}\n")
+
+
+def _ensure_flusher_started():
+    """Start the background flusher thread on first use."""
+    global _flusher_started
+    if _flusher_started:
+        return
+    with _flusher_start_lock:
+        if _flusher_started:
+            return
+        thread = threading.Thread(
+            target=_flush_bookings_forever,
+            name="booking-log-flusher",
+            daemon=True
+        )
+        thread.start()
+        _flusher_started = True
+
+
+def _flush_bookings_forever():
+    """Drain the booking queue in batches, one write per flush window."""
+    while True:
+        batch = [_booking_queue.get()]
+        # Let a burst of concurrent bookings accumulate before writing
+        time_module.sleep(_FLUSH_WINDOW_SECONDS)
+        try:
+            while True:
+                batch.append(_booking_queue.get_nowait())
+        except queue.Empty:
+            pass
+        _write_booking_batch(batch)
+
+
+def _write_booking_batch(batch: List[str]):
+    """Append a batch of booking lines to the log and compact when due."""
+    global _bookings_since_compact
+    try:
+        with _log_write_lock:
+            with open(BOOKING_LOG, 'a', encoding='utf-8') as f:
+                f.writelines(batch)
+                f.flush()
+        logger.debug("[schedules.py._write_booking_batch] Flushed %s bookings to log", len(batch))
+    except Exception as e:
+        logger.error("[schedules.py._write_booking_batch] Error writing booking log: %s", e)
+        return
+
+    _bookings_since_compact += len(batch)
+    if _bookings_since_compact >= _COMPACT_EVERY:
+        compact_bookings()
+
+
+def _flush_pending_bookings():
+    """Synchronously write any bookings still waiting in the queue."""
+    batch = []
+    try:
+        while True:
+            batch.append(_booking_queue.get_nowait())
+    except queue.Empty:
+        pass
+    if batch:
+        _write_booking_batch(batch)
+
+
+def compact_bookings() -> bool:
+    """
+    Fold logged bookings into schedules.csv and truncate the log.
+
+    The in-memory state already reflects every logged booking, so a full
+    save followed by removing the log is equivalent to applying it.
+
+    Returns:
+        True if compaction succeeded, False otherwise
+    """
+    global _bookings_since_compact
+    # Queued entries are already reflected in SCHEDULES_DB, so the full save
+    # below subsumes them; drop them rather than re-logging
+    try:
+        while True:
+            _booking_queue.get_nowait()
+    except queue.Empty:
+        pass
+
+    if not save_schedules_to_csv():
+        return False
+
+    try:
+        BOOKING_LOG.unlink()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error("[schedules.py.compact_bookings] Error removing booking log: %s", e)
+        return False
+
+    _bookings_since_compact = 0
+    logger.info("[schedules.py.compact_bookings] Booking log compacted into CSV")
+    return True
+
+
 def clear_schedule_cache():
     """
     Clear the schedule cache and reload from CSV (useful for testing).
     """
-    logger.info(f"[schedules.py.clear_schedule_cache] Reloading schedules from CSV")
+    logger.info("[schedules.py.clear_schedule_cache] Reloading schedules from CSV")
+    # Make queued bookings durable in the log before the in-memory state is
+    # replaced, so the replay during initialization picks them up
+    _flush_pending_bookings()
     initialize_database()
 
 
@@ -162,22 +384,35 @@ def save_schedules_to_csv():
     This allows for persistence of booked appointments.
     """
     try:
-        with open(CSV_FILE, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['provider_id', 'date', 'time_slots', 'is_available']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for provider_id, schedules in sorted(SCHEDULES_DB.items()):
-                for schedule in sorted(schedules, key=lambda s: s.date):
-                    writer.writerow({
-                        'provider_id': schedule.provider_id,
-                        'date': schedule.date,
-                        'time_slots': ','.join(schedule.available_slots),
-                        'is_available': '1'
-                    })
-        
-        logger.info(f"[schedules.py.save_schedules_to_csv] Saved schedules to CSV")
+        # Render the whole CSV in memory first (csv.writer handles quoting
+        # the comma-joined time_slots field), then publish it atomically:
+        # one write to a temp file and an os.replace, so a crash mid-save
+        # can never leave a half-written schedules.csv behind
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['provider_id', 'date', 'time_slots', 'is_available'])
+        # SCHEDULES_DB is kept in provider/date order by the loader, so
+        # iteration order is already the CSV order
+        writer.writerows(
+            [schedule.provider_id, schedule.date, ','.join(schedule.available_slots), '1']
+            for schedules in SCHEDULES_DB.values()
+            for schedule in schedules.values()
+        )
+
+        tmp_file = CSV_FILE.with_suffix('.csv.tmp')
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_file, CSV_FILE)
+
+        logger.info("[schedules.py.save_schedules_to_csv] Saved schedules to CSV")
         return True
     except Exception as e:
-        logger.error(f"[schedules.py.save_schedules_to_csv] Error saving CSV: {e}")
+        logger.error("[schedules.py.save_schedules_to_csv] Error saving CSV: %s", e)
         return False
+
+
+# Initialize on module load
+initialize_database()
+
+# Fold any outstanding logged bookings into the CSV on clean shutdown
+atexit.register(compact_bookings)
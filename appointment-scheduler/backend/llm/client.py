@@ -1,40 +1,137 @@
 """
 OpenAI client wrapper for LLM integration.
 """
+import asyncio
 import os
 import logging
+import random
 from typing import List, Dict, Optional
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, RateLimitError
 from dotenv import load_dotenv
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 multiplexes concurrent completions over one TLS connection,
+# avoiding per-request handshakes under fan-out. It needs the optional h2
+# package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it.
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Cap on completion calls in flight at once. Bursts beyond the cap queue on
+# the semaphore instead of stampeding the API and tripping rate limits.
+_MAX_CONCURRENT_COMPLETIONS = int(os.getenv("OPENAI_MAX_CONCURRENCY", "10"))
+_completion_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_COMPLETIONS)
+
+# Retry policy for rate-limited completion calls: exponential backoff with
+# jitter, capped per attempt, honoring the server's Retry-After when sent
+_MAX_RETRY_ATTEMPTS = 5
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+def _retry_delay(error: RateLimitError, attempt: int) -> float:
+    """
+    Compute the delay before retrying a rate-limited completion call.
+
+    Args:
+        error: The RateLimitError raised by the API
+        attempt: Zero-based index of the attempt that just failed
+
+    Returns:
+        Seconds to sleep before the next attempt
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_BACKOFF_SECONDS)
+        except ValueError:
+            pass
+    # Full jitter keeps concurrent retries from re-bursting in lockstep
+    return min(2 ** attempt + random.random(), _MAX_BACKOFF_SECONDS)
+
+
+# One AsyncOpenAI client per API key, created lazily and shared across
+# LLMClient instances so the underlying HTTP connection pool is reused
+# instead of being rebuilt per instance
+_openai_clients: Dict[str, AsyncOpenAI] = {}
+
+
+def _get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get (or create) the shared async OpenAI client for an API key."""
+    client = _openai_clients.get(api_key)
+    if client is None:
+        logger.debug("[client.py._get_openai_client] Creating shared AsyncOpenAI client (http2=%s)", _HTTP2_AVAILABLE)
+        if not _HTTP2_AVAILABLE:
+            logger.info("[client.py._get_openai_client] h2 package not installed, falling back to HTTP/1.1")
+        # Keep-alive pooling avoids a TCP+TLS handshake per completion call
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+        )
+        _openai_clients[api_key] = client
+    return client
+
 
 class LLMClient:
     """Wrapper for OpenAI API with function calling support."""
-    
+
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
         """
         Initialize LLM client.
-        
+
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: Model to use for completions
         """
-        logger.info(f"[client.py.LLMClient.__init__] Initializing LLM client with model: {model}")
-        
+        logger.info("[client.py.LLMClient.__init__] Initializing LLM client with model: %s", model)
+
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             logger.error("[client.py.LLMClient.__init__] OpenAI API key not found")
             raise ValueError("OpenAI API key required")
-        
-        self.client = OpenAI(api_key=self.api_key)
+
+        self.client = _get_openai_client(self.api_key)
         self.model = model
         logger.info("[client.py.LLMClient.__init__] LLM client initialized successfully")
-    
-    def chat_completion(
+
+    async def _create_with_retry(self, kwargs: Dict):
+        """
+        Call chat.completions.create, retrying rate-limited attempts.
+
+        A 429 no longer aborts the whole turn: the call backs off (honoring
+        the server's Retry-After header when present) and retries up to
+        _MAX_RETRY_ATTEMPTS times. The semaphore is released while sleeping
+        so waiting retries don't hold a concurrency slot.
+
+        Args:
+            kwargs: Keyword arguments for chat.completions.create
+
+        Returns:
+            The API response (or stream, when kwargs includes stream=True)
+        """
+        for attempt in range(_MAX_RETRY_ATTEMPTS):
+            try:
+                async with _completion_semaphore:
+                    return await self.client.chat.completions.create(**kwargs)
+            except RateLimitError as e:
+                if attempt == _MAX_RETRY_ATTEMPTS - 1:
+                    logger.error("[client.py.LLMClient._create_with_retry] Still rate limited after %s attempts", _MAX_RETRY_ATTEMPTS)
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning("[client.py.LLMClient._create_with_retry] Rate limited (attempt %s/%s), retrying in %.1fs", attempt + 1, _MAX_RETRY_ATTEMPTS, delay)
+                await asyncio.sleep(delay)
+
+    async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         tools: Optional[List[Dict]] = None,
@@ -42,72 +139,106 @@ class LLMClient:
     ) -> Dict:
         """
         Get a chat completion from the LLM.
-        
+
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             tools: Optional list of function tools for function calling
             tool_choice: Optional tool choice ("auto", "none", or specific function)
-            
+
         Returns:
             Response dictionary from OpenAI API
         """
-        logger.debug(f"[client.py.LLMClient.chat_completion] Requesting chat completion with {len(messages)} messages")
+        logger.debug("[client.py.LLMClient.chat_completion] Requesting chat completion with %s messages", len(messages))
         if tools:
-            logger.debug(f"[client.py.LLMClient.chat_completion] Using {len(tools)} tools")
-        
+            logger.debug("[client.py.LLMClient.chat_completion] Using %s tools", len(tools))
+
         kwargs = {
             "model": self.model,
             "messages": messages
         }
-        
+
         if tools:
             kwargs["tools"] = tools
             if tool_choice:
                 kwargs["tool_choice"] = tool_choice
-        
+
         try:
-            response = self.client.chat.completions.create(**kwargs)
+            response = await self._create_with_retry(kwargs)
             logger.debug("[client.py.LLMClient.chat_completion] Chat completion successful")
             return response
         except Exception as e:
-            logger.error(f"[client.py.LLMClient.chat_completion] Error during chat completion: {e}")
+            logger.error("[client.py.LLMClient.chat_completion] Error during chat completion: %s", e)
             raise
-    
+
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]] = None,
+        tool_choice: Optional[str] = None
+    ):
+        """
+        Start a streaming chat completion.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            tools: Optional list of function tools for function calling
+            tool_choice: Optional tool choice ("auto", "none", or specific function)
+
+        Returns:
+            Async iterator of response chunks from the OpenAI API
+        """
+        logger.debug("[client.py.LLMClient.chat_completion_stream] Requesting streaming chat completion with %s messages", len(messages))
+
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True
+        }
+
+        if tools:
+            kwargs["tools"] = tools
+            if tool_choice:
+                kwargs["tool_choice"] = tool_choice
+
+        try:
+            return await self._create_with_retry(kwargs)
+        except Exception as e:
+            logger.error("[client.py.LLMClient.chat_completion_stream] Error during streaming chat completion: %s", e)
+            raise
+
     def extract_message_content(self, response) -> str:
         """
         Extract message content from response.
-        
+
         Args:
             response: OpenAI API response
-            
+
         Returns:
             Message content as string
         """
         content = response.choices[0].message.content or ""
-        logger.debug(f"[client.py.LLMClient.extract_message_content] Extracted message content (length: {len(content)})")
+        logger.debug("[client.py.LLMClient.extract_message_content] Extracted message content (length: %s)", len(content))
         return content
-    
+
     def extract_tool_calls(self, response) -> List[Dict]:
         """
         Extract tool calls from response.
-        
+
         Args:
             response: OpenAI API response
-            
+
         Returns:
             List of tool call dictionaries
         """
-        message = response.choices[0].message
-        if hasattr(message, 'tool_calls') and message.tool_calls:
-            tool_calls = [
-                {
-                    "id": tc.id,
-                    "function": tc.function.name,
-                    "arguments": tc.function.arguments
-                }
-                for tc in message.tool_calls
-            ]
-            logger.debug(f"[client.py.LLMClient.extract_tool_calls] Extracted {len(tool_calls)} tool calls")
-            return tool_calls
-        logger.debug("[client.py.LLMClient.extract_tool_calls] No tool calls in response")
-        return []
+        # The SDK always exposes tool_calls (None when absent), so a plain
+        # attribute read suffices; hasattr would pay for a second lookup
+        tool_calls = [
+            {
+                "id": tc.id,
+                "function": tc.function.name,
+                "arguments": tc.function.arguments
+            }
+            for tc in response.choices[0].message.tool_calls or ()
+        ]
+        logger.debug("[client.py.LLMClient.extract_tool_calls] Extracted %s tool calls", len(tool_calls))
+        return tool_calls
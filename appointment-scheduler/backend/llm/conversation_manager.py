@@ -1,44 +1,206 @@
 """
 Conversation state management for multi-turn conversations.
 """
+import os
+import sys
+import time
 import uuid
 import logging
+import orjson
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Union
 from backend.models.schemas import ConversationMessage, Provider, ProviderMatch
 from backend.models.constants import ConversationState
 
 logger = logging.getLogger(__name__)
 
+# How long conversations live in Redis before expiring
+_REDIS_TTL_SECONDS = 3600
+
+# Bounds for the in-process store. Redis expiry covers the Redis path; these
+# keep a long-running single-process server from accumulating conversation
+# histories indefinitely.
+_MAX_CONVERSATIONS = 1000
+_CONVERSATION_TTL_SECONDS = 3600
+
+# Most recent messages included in LLM calls. Older turns still live in the
+# stored history, but input tokens (and prefill latency) stop growing with
+# conversation length; booking-relevant facts persist in the conversation
+# context rather than in old turns.
+_MAX_LLM_MESSAGES = 24
+
+# Static instruction block shared by every conversation. Kept byte-identical
+# across turns and conversations so provider-side prompt caching can reuse
+# the prefill for this prefix; anything that changes per turn (date/time,
+# state guidance) goes in the dynamic system message appended after it.
+STATIC_SYSTEM_PROMPT = """You are a helpful medical appointment scheduling assistant.
+
+Your role is to:
+1. Understand the patient's health issue
+2. Match them with the appropriate healthcare provider
+3. Help them find a suitable appointment time
+4. Confirm the appointment details
+
+VOICE OUTPUT FORMATTING:
+- Keep responses concise and conversational for spoken output
+- Avoid parentheses - integrate information naturally into sentences
+- Use "also known as" or "or" instead of parentheses
+- Format times and dates in a natural speaking style
+- Instead of "(Dentist)", say "who is a dentist" or "dentist at..."
+- Skip technical state information like "(State: provider_matched)"
+
+Be empathetic, clear, and efficient. Ask clarifying questions when needed.
+Use the provided functions to:
+- identify_provider: Find the right doctor for their issue
+- check_availability: Look up available appointment times
+- create_appointment: Book the appointment once all details are confirmed
+
+IMPORTANT:
+- Use the CURRENT DATE AND TIME provided to understand relative dates like "tomorrow", "next week", "Wednesday", etc.
+- When checking availability, call check_availability with num_days parameter to look ahead the appropriate number of days.
+- If a function returns an error (like no providers available or no time slots), you MUST communicate this clearly to the user.
+- Never stay silent when a function call fails or returns no results.
+- If no providers are available for a specialty, apologize and suggest alternatives (like seeing a General Practitioner).
+- If no time slots are available, offer to check other dates or suggest contacting the office directly.
+- Always provide helpful next steps when something isn't available.
+
+Always confirm key details before creating an appointment."""
+
+# State-specific guidance appended to the dynamic system message
+_STATE_PROMPTS = {
+    ConversationState.INITIAL: "The conversation is just starting. Introduce yourself as an AI booking assistant from Hippocratic AI, then ask how you can help with scheduling their appointment.",
+    ConversationState.ISSUE_IDENTIFIED: "You've identified the patient's health issue. Use identify_provider to find the right doctor.",
+    ConversationState.PROVIDER_MATCHED: "You've matched the patient with {provider_name}. Use check_availability to show available times.",
+    ConversationState.AVAILABILITY_CHECKED: "You've shown available times. Help the patient choose and confirm the appointment details.",
+    ConversationState.APPOINTMENT_CONFIRMED: "The appointment has been confirmed. Provide the details and ask if they need anything else.",
+}
+
+
+@lru_cache(maxsize=2)
+def _format_current_date(day: date) -> str:
+    """
+    Render a date as e.g. "Monday, January 06, 2026".
+
+    strftime is surprisingly expensive (locale machinery per call) and the
+    result only changes once a day, so it is memoized per calendar day.
+    """
+    return day.strftime("%A, %B %d, %Y")
+
+
+def _connect_redis():
+    """
+    Build an async Redis client if REDIS_URL is configured.
+
+    The async client is used so conversation reads/writes never block the
+    event loop alongside the async request handlers. It connects lazily on
+    the first command (there is no running loop at import time to ping from),
+    so an unreachable Redis surfaces as an error on first use rather than
+    at startup.
+
+    Returns:
+        Async Redis client or None if Redis is not configured/available
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+
+    try:
+        import redis.asyncio
+    except ImportError:
+        logger.warning("[conversation_manager.py._connect_redis] REDIS_URL set but redis package not installed, using in-process store")
+        return None
+
+    client = redis.asyncio.Redis.from_url(redis_url, decode_responses=True)
+    logger.info("[conversation_manager.py._connect_redis] Using Redis conversation store at %s", redis_url)
+    return client
+
 
 class ConversationManager:
     """
     Manages conversation state and history for appointment scheduling.
+
+    Conversations are stored in Redis when REDIS_URL is configured, so
+    multiple workers can share state; otherwise a bounded in-process LRU
+    store with a TTL is used so memory stays capped on long-running servers.
+
+    The store-touching methods are coroutines so the Redis round-trips run
+    on the async client and never block the event loop; the in-process path
+    is pure memory and completes without suspending.
     """
-    
+
     def __init__(self):
         """Initialize conversation manager."""
         logger.info("[conversation_manager.py.ConversationManager.__init__] Initializing conversation manager")
-        self.conversations: Dict[str, Dict] = {}
-    
-    def create_conversation(self) -> str:
+        self.conversations: "OrderedDict[str, Dict]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._redis = _connect_redis()
+
+    @staticmethod
+    def _key(conversation_id: str) -> str:
+        """Redis key for a conversation."""
+        return f"conversation:{conversation_id}"
+
+    async def _load(self, conversation_id: str) -> Optional[Dict]:
+        """Load a conversation from the backing store."""
+        if self._redis:
+            data = await self._redis.get(self._key(conversation_id))
+            return orjson.loads(data) if data else None
+
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+
+        if time.monotonic() - self._last_access[conversation_id] > _CONVERSATION_TTL_SECONDS:
+            logger.info("[conversation_manager.py.ConversationManager._load] Conversation expired: %s", conversation_id)
+            del self.conversations[conversation_id]
+            del self._last_access[conversation_id]
+            return None
+
+        self.conversations.move_to_end(conversation_id)
+        self._last_access[conversation_id] = time.monotonic()
+        return conversation
+
+    async def _store(self, conversation_id: str, conversation: Dict):
+        """Write a conversation back to the backing store."""
+        if self._redis:
+            await self._redis.set(
+                self._key(conversation_id),
+                orjson.dumps(conversation),
+                ex=_REDIS_TTL_SECONDS
+            )
+            return
+
+        self.conversations[conversation_id] = conversation
+        self.conversations.move_to_end(conversation_id)
+        self._last_access[conversation_id] = time.monotonic()
+
+        # Evict least-recently-used conversations beyond the cap
+        while len(self.conversations) > _MAX_CONVERSATIONS:
+            evicted_id, _ = self.conversations.popitem(last=False)
+            self._last_access.pop(evicted_id, None)
+            logger.info("[conversation_manager.py.ConversationManager._store] Evicted least-recently-used conversation: %s", evicted_id)
+
+    async def create_conversation(self) -> str:
         """
         Create a new conversation.
-        
+
         Returns:
             Conversation ID
         """
         conversation_id = str(uuid.uuid4())
-        logger.info(f"[conversation_manager.py.ConversationManager.create_conversation] Creating new conversation: {conversation_id}")
-        
-        self.conversations[conversation_id] = {
+        logger.info("[conversation_manager.py.ConversationManager.create_conversation] Creating new conversation: %s", conversation_id)
+
+        await self._store(conversation_id, {
             "id": conversation_id,
             "state": ConversationState.INITIAL,
             "messages": [],
             "context": {}
-        }
+        })
         return conversation_id
-    
-    def add_message(
+
+    async def add_message(
         self,
         conversation_id: str,
         role: str,
@@ -46,185 +208,198 @@ class ConversationManager:
     ):
         """
         Add a message to the conversation history.
-        
+
         Args:
             conversation_id: Conversation ID
             role: Message role ("user", "assistant", "system")
             content: Message content
         """
-        if conversation_id not in self.conversations:
-            logger.error(f"[conversation_manager.py.ConversationManager.add_message] Conversation not found: {conversation_id}")
+        conversation = await self._load(conversation_id)
+        if conversation is None:
+            logger.error("[conversation_manager.py.ConversationManager.add_message] Conversation not found: %s", conversation_id)
             raise ValueError(f"Conversation {conversation_id} not found")
-        
-        logger.debug(f"[conversation_manager.py.ConversationManager.add_message] Adding {role} message to conversation: {conversation_id}")
-        
-        self.conversations[conversation_id]["messages"].append({
-            "role": role,
+
+        logger.debug("[conversation_manager.py.ConversationManager.add_message] Adding %s message to conversation: %s", role, conversation_id)
+
+        conversation["messages"].append({
+            # Roles come from a tiny fixed set, so interning makes every
+            # stored message share one string object per role
+            "role": sys.intern(role),
             "content": content
         })
-    
-    def get_messages(self, conversation_id: str) -> List[Dict]:
+        await self._store(conversation_id, conversation)
+
+    async def get_messages(self, conversation_id: str) -> List[Dict]:
         """
         Get all messages in a conversation.
-        
+
         Args:
             conversation_id: Conversation ID
-            
+
         Returns:
             List of message dictionaries
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"[conversation_manager.py.ConversationManager.get_messages] Conversation not found: {conversation_id}")
+        conversation = await self._load(conversation_id)
+        if conversation is None:
+            logger.warning("[conversation_manager.py.ConversationManager.get_messages] Conversation not found: %s", conversation_id)
             return []
-        
-        messages = self.conversations[conversation_id]["messages"]
-        logger.debug(f"[conversation_manager.py.ConversationManager.get_messages] Retrieved {len(messages)} messages for conversation: {conversation_id}")
+
+        messages = conversation["messages"]
+        logger.debug("[conversation_manager.py.ConversationManager.get_messages] Retrieved %s messages for conversation: %s", len(messages), conversation_id)
+        return messages
+
+    async def get_messages_for_llm(self, conversation_id: str) -> List[Dict]:
+        """
+        Get the messages to include in an LLM call.
+
+        Returns at most the last _MAX_LLM_MESSAGES messages so token cost
+        per turn is bounded on long conversations; the full history remains
+        available via get_messages.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            List of message dictionaries
+        """
+        messages = await self.get_messages(conversation_id)
+        if len(messages) > _MAX_LLM_MESSAGES:
+            logger.debug("[conversation_manager.py.ConversationManager.get_messages_for_llm] Truncating %s messages to last %s", len(messages), _MAX_LLM_MESSAGES)
+            return messages[-_MAX_LLM_MESSAGES:]
         return messages
-    
-    def get_state(self, conversation_id: str) -> str:
+
+    async def get_state(self, conversation_id: str) -> str:
         """
         Get the current state of a conversation.
-        
+
         Args:
             conversation_id: Conversation ID
-            
+
         Returns:
             Current state
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"[conversation_manager.py.ConversationManager.get_state] Conversation not found: {conversation_id}, returning INITIAL state")
+        conversation = await self._load(conversation_id)
+        if conversation is None:
+            logger.warning("[conversation_manager.py.ConversationManager.get_state] Conversation not found: %s, returning INITIAL state", conversation_id)
             return ConversationState.INITIAL
-        
-        state = self.conversations[conversation_id]["state"]
-        logger.debug(f"[conversation_manager.py.ConversationManager.get_state] State for conversation {conversation_id}: {state}")
+
+        state = conversation["state"]
+        logger.debug("[conversation_manager.py.ConversationManager.get_state] State for conversation %s: %s", conversation_id, state)
         return state
-    
-    def set_state(self, conversation_id: str, state: ConversationState):
+
+    async def set_state(self, conversation_id: str, state: ConversationState):
         """
         Set the state of a conversation.
-        
+
         Args:
             conversation_id: Conversation ID
             state: New state
         """
-        if conversation_id not in self.conversations:
-            logger.error(f"[conversation_manager.py.ConversationManager.set_state] Conversation not found: {conversation_id}")
+        conversation = await self._load(conversation_id)
+        if conversation is None:
+            logger.error("[conversation_manager.py.ConversationManager.set_state] Conversation not found: %s", conversation_id)
             raise ValueError(f"Conversation {conversation_id} not found")
-        
-        old_state = self.conversations[conversation_id]["state"]
-        self.conversations[conversation_id]["state"] = state
-        logger.info(f"[conversation_manager.py.ConversationManager.set_state] Conversation {conversation_id} state changed: {old_state} -> {state}")
-    
-    def update_context(self, conversation_id: str, key: str, value: Any):
+
+        old_state = conversation["state"]
+        conversation["state"] = state
+        await self._store(conversation_id, conversation)
+        logger.info("[conversation_manager.py.ConversationManager.set_state] Conversation %s state changed: %s -> %s", conversation_id, old_state, state)
+
+    async def update_context(self, conversation_id: str, key: str, value: Any):
         """
         Update conversation context with a key-value pair.
-        
+
         Args:
             conversation_id: Conversation ID
             key: Context key
             value: Context value
         """
-        if conversation_id not in self.conversations:
-            logger.error(f"[conversation_manager.py.ConversationManager.update_context] Conversation not found: {conversation_id}")
+        conversation = await self._load(conversation_id)
+        if conversation is None:
+            logger.error("[conversation_manager.py.ConversationManager.update_context] Conversation not found: %s", conversation_id)
             raise ValueError(f"Conversation {conversation_id} not found")
-        
-        logger.debug(f"[conversation_manager.py.ConversationManager.update_context] Updating context for conversation {conversation_id}: {key}={value}")
-        self.conversations[conversation_id]["context"][key] = value
-    
-    def get_context(self, conversation_id: str, key: Optional[str] = None) -> Optional[Union[str, Dict, Any]]:
+
+        logger.debug("[conversation_manager.py.ConversationManager.update_context] Updating context for conversation %s: %s=%s", conversation_id, key, value)
+        conversation["context"][key] = value
+        await self._store(conversation_id, conversation)
+
+    async def get_context(self, conversation_id: str, key: Optional[str] = None) -> Optional[Union[str, Dict, Any]]:
         """
         Get conversation context.
-        
+
         Args:
             conversation_id: Conversation ID
             key: Optional specific key to retrieve
-            
+
         Returns:
             Context value or entire context dict
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"[conversation_manager.py.ConversationManager.get_context] Conversation not found: {conversation_id}")
+        conversation = await self._load(conversation_id)
+        if conversation is None:
+            logger.warning("[conversation_manager.py.ConversationManager.get_context] Conversation not found: %s", conversation_id)
             return None
-        
-        context = self.conversations[conversation_id]["context"]
+
+        context = conversation["context"]
         if key:
             value = context.get(key)
-            logger.debug(f"[conversation_manager.py.ConversationManager.get_context] Retrieved context key '{key}' for conversation {conversation_id}: {value}")
+            logger.debug("[conversation_manager.py.ConversationManager.get_context] Retrieved context key '%s' for conversation %s: %s", key, conversation_id, value)
             return value
-        
-        logger.debug(f"[conversation_manager.py.ConversationManager.get_context] Retrieved full context for conversation {conversation_id}")
+
+        logger.debug("[conversation_manager.py.ConversationManager.get_context] Retrieved full context for conversation %s", conversation_id)
         return context
-    
-    def get_system_prompt(self, conversation_id: str) -> str:
+
+    def get_static_system_prompt(self) -> str:
+        """
+        Get the static system prompt shared by every conversation.
+
+        Returns:
+            System prompt string (identical across turns, prompt-cache friendly)
+        """
+        return STATIC_SYSTEM_PROMPT
+
+    async def get_dynamic_system_prompt(self, conversation_id: str) -> str:
         """
-        Generate system prompt based on conversation state.
-        
+        Generate the per-turn system context: current date/time and
+        state-specific guidance. Sent as a second system message after the
+        static prompt so the static prefix stays cacheable.
+
         Args:
             conversation_id: Conversation ID
-            
+
         Returns:
-            System prompt string
+            Dynamic system prompt string
         """
-        from datetime import datetime
-        
-        state = self.get_state(conversation_id)
-        logger.debug(f"[conversation_manager.py.ConversationManager.get_system_prompt] Generating system prompt for conversation {conversation_id} in state: {state}")
-        
-        # Get current date and time
+        state = await self.get_state(conversation_id)
+        logger.debug("[conversation_manager.py.ConversationManager.get_dynamic_system_prompt] Generating dynamic prompt for conversation %s in state: %s", conversation_id, state)
+
+        # Get current date and time; the date string is memoized per day
         now = datetime.now()
-        current_date = now.strftime("%A, %B %d, %Y")  # e.g., "Monday, January 06, 2026"
+        current_date = _format_current_date(now.date())  # e.g., "Monday, January 06, 2026"
         current_time = now.strftime("%I:%M %p")  # e.g., "02:30 PM"
-        
-        base_prompt = f"""You are a helpful medical appointment scheduling assistant.
 
-CURRENT DATE AND TIME: {current_date} at {current_time}
+        parts = [f"CURRENT DATE AND TIME: {current_date} at {current_time}"]
 
-Your role is to:
-1. Understand the patient's health issue
-2. Match them with the appropriate healthcare provider
-3. Help them find a suitable appointment time
-4. Confirm the appointment details
+        state_prompt = _STATE_PROMPTS.get(state)
+        if state_prompt:
+            if state == ConversationState.PROVIDER_MATCHED:
+                context = await self.get_context(conversation_id) or {}
+                provider_name = context.get("provider_name", "the provider")
+                state_prompt = state_prompt.format(provider_name=provider_name)
+            parts.append(state_prompt)
 
-VOICE OUTPUT FORMATTING:
-- Keep responses concise and conversational for spoken output
-- Avoid parentheses - integrate information naturally into sentences
-- Use "also known as" or "or" instead of parentheses
-- Format times and dates in a natural speaking style
-- Instead of "(Dentist)", say "who is a dentist" or "dentist at..."
-- Skip technical state information like "(State: provider_matched)"
+        return "\n\n".join(parts)
 
-Be empathetic, clear, and efficient. Ask clarifying questions when needed.
-Use the provided functions to:
-- identify_provider: Find the right doctor for their issue
-- check_availability: Look up available appointment times
-- create_appointment: Book the appointment once all details are confirmed
+    async def get_system_prompt(self, conversation_id: str) -> str:
+        """
+        Generate the full system prompt based on conversation state.
 
-IMPORTANT: 
-- Use the CURRENT DATE AND TIME above to understand relative dates like "tomorrow", "next week", "Wednesday", etc.
-- When checking availability, call check_availability with num_days parameter to look ahead the appropriate number of days.
-- If a function returns an error (like no providers available or no time slots), you MUST communicate this clearly to the user.
-- Never stay silent when a function call fails or returns no results.
-- If no providers are available for a specialty, apologize and suggest alternatives (like seeing a General Practitioner).
-- If no time slots are available, offer to check other dates or suggest contacting the office directly.
-- Always provide helpful next steps when something isn't available.
+        Convenience accessor combining the static and dynamic sections for
+        callers that send a single system message.
 
-Always confirm key details before creating an appointment."""
-        
-        if state == ConversationState.INITIAL:
-            return base_prompt + "\n\nThe conversation is just starting. Introduce yourself as an AI booking assistant from Hippocratic AI, then ask how you can help with scheduling their appointment."
-        
-        elif state == ConversationState.ISSUE_IDENTIFIED:
-            return base_prompt + "\n\nYou've identified the patient's health issue. Use identify_provider to find the right doctor."
-        
-        elif state == ConversationState.PROVIDER_MATCHED:
-            context = self.get_context(conversation_id)
-            provider_name = context.get("provider_name", "the provider")
-            return base_prompt + f"\n\nYou've matched the patient with {provider_name}. Use check_availability to show available times."
-        
-        elif state == ConversationState.AVAILABILITY_CHECKED:
-            return base_prompt + "\n\nYou've shown available times. Help the patient choose and confirm the appointment details."
-        
-        elif state == ConversationState.APPOINTMENT_CONFIRMED:
-            return base_prompt + "\n\nThe appointment has been confirmed. Provide the details and ask if they need anything else."
-        
-        return base_prompt
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            System prompt string
+        """
+        return self.get_static_system_prompt() + "\n\n" + await self.get_dynamic_system_prompt(conversation_id)
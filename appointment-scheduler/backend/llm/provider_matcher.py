@@ -2,63 +2,113 @@
 Provider matching logic using LLM and rules-based approach.
 """
 import logging
-from typing import Optional, List
+import re
+from functools import lru_cache
+from typing import Optional, List, Tuple
 from backend.models.schemas import Provider, ProviderMatch
 from backend.models.constants import ISSUE_TO_SPECIALTY, Specialty
-from backend.database.providers import get_providers_by_specialty, get_best_provider_for_specialty
+from backend.database.providers import (
+    get_providers_by_specialty,
+    get_best_provider_for_specialty,
+    register_change_listener
+)
 
 logger = logging.getLogger(__name__)
 
+# Precompiled alternation over all known issue keywords, compiled once at
+# import. Longer keywords come first in the pattern so multi-word entries
+# like "chest pain" win over shorter overlapping ones like "back". A single
+# regex scan replaces the per-call loop over the keyword table.
+_KEYWORD_PATTERN = re.compile(
+    "|".join(
+        re.escape(keyword)
+        for keyword in sorted(ISSUE_TO_SPECIALTY, key=len, reverse=True)
+    )
+)
+
+
+def _find_specialty_keyword(health_issue_lower: str) -> Tuple[Optional[str], Optional[Specialty]]:
+    """
+    Find the first issue keyword present in a lowercased health issue.
+
+    Args:
+        health_issue_lower: Lowercased health issue description
+
+    Returns:
+        Tuple of (matched keyword, specialty) or (None, None) if no match
+    """
+    match = _KEYWORD_PATTERN.search(health_issue_lower)
+    if match:
+        keyword = match.group(0)
+        return keyword, ISSUE_TO_SPECIALTY[keyword]
+    return None, None
+
 
 def match_provider_for_issue(health_issue: str) -> Optional[ProviderMatch]:
     """
     Match the best provider for a health issue.
-    
+
     This uses a rule-based approach with keyword matching to determine
     the appropriate specialty, then selects the best-rated provider.
-    
+
+    The issue text is normalized (stripped and lowercased) before matching,
+    so surface variants of the same complaint ("Back pain", " back pain ")
+    share one memoized result.
+
     Args:
         health_issue: Description of the patient's health issue
-        
+
     Returns:
         ProviderMatch object or None if no match found
     """
-    logger.info(f"[provider_matcher.py.match_provider_for_issue] Matching provider for health issue: {health_issue}")
-    
-    health_issue_lower = health_issue.lower()
-    
+    return _match_provider_normalized(health_issue.strip().lower())
+
+
+@lru_cache(maxsize=256)
+def _match_provider_normalized(health_issue_lower: str) -> Optional[ProviderMatch]:
+    """
+    Cached matching implementation over a normalized issue string.
+
+    Matching is deterministic over the static provider database, so results
+    are memoized per normalized health-issue string. The cache is cleared
+    when the provider database is reinitialized.
+
+    Args:
+        health_issue_lower: Stripped, lowercased health issue description
+
+    Returns:
+        ProviderMatch object or None if no match found
+    """
+    logger.info("[provider_matcher.py._match_provider_normalized] Matching provider for health issue: %s", health_issue_lower)
+
     # Try to find matching specialty from keywords
-    matched_specialty = None
-    match_keyword = None
-    
-    for keyword, specialty in ISSUE_TO_SPECIALTY.items():
-        if keyword in health_issue_lower:
-            matched_specialty = specialty
-            match_keyword = keyword
-            logger.debug(f"[provider_matcher.py.match_provider_for_issue] Matched keyword '{keyword}' to specialty: {specialty}")
-            break
-    
+    match_keyword, matched_specialty = _find_specialty_keyword(health_issue_lower)
+    if match_keyword:
+        logger.debug("[provider_matcher.py._match_provider_normalized] Matched keyword '%s' to specialty: %s", match_keyword, matched_specialty)
+
     # If no specific match, default to general practitioner
     if not matched_specialty:
         matched_specialty = Specialty.GENERAL_PRACTITIONER
         match_reason = "No specific specialty identified, recommending general practitioner for initial evaluation"
         confidence = 0.6
-        logger.info(f"[provider_matcher.py.match_provider_for_issue] No specific match found, defaulting to general practitioner")
+        logger.info("[provider_matcher.py._match_provider_normalized] No specific match found, defaulting to general practitioner")
     else:
         match_reason = f"Identified '{match_keyword}' in health issue, recommending {matched_specialty}"
         confidence = 0.9
-        logger.info(f"[provider_matcher.py.match_provider_for_issue] Matched specialty: {matched_specialty} (confidence: {confidence})")
+        logger.info("[provider_matcher.py._match_provider_normalized] Matched specialty: %s (confidence: %s)", matched_specialty, confidence)
     
     # Get the best provider for this specialty
     provider = get_best_provider_for_specialty(matched_specialty)
     
     if not provider:
-        logger.warning(f"[provider_matcher.py.match_provider_for_issue] No provider found for specialty: {matched_specialty}")
+        logger.warning("[provider_matcher.py._match_provider_normalized] No provider found for specialty: %s", matched_specialty)
         return None
     
-    logger.info(f"[provider_matcher.py.match_provider_for_issue] Selected provider: {provider.name} (ID: {provider.id})")
+    logger.info("[provider_matcher.py._match_provider_normalized] Selected provider: %s (ID: %s)", provider.name, provider.id)
     
-    return ProviderMatch(
+    # Built from the trusted provider record and literal confidences, so
+    # validation is skipped
+    return ProviderMatch.model_construct(
         provider_id=provider.id,
         provider_name=provider.name,
         specialty=provider.specialty,
@@ -78,41 +128,39 @@ def get_multiple_provider_options(health_issue: str, max_results: int = 3) -> Li
     Returns:
         List of ProviderMatch objects
     """
-    logger.info(f"[provider_matcher.py.get_multiple_provider_options] Getting multiple provider options for: {health_issue} (max: {max_results})")
+    logger.info("[provider_matcher.py.get_multiple_provider_options] Getting multiple provider options for: %s (max: %s)", health_issue, max_results)
     
     health_issue_lower = health_issue.lower()
-    
+
     # Find matching specialty
-    matched_specialty = None
-    for keyword, specialty in ISSUE_TO_SPECIALTY.items():
-        if keyword in health_issue_lower:
-            matched_specialty = specialty
-            logger.debug(f"[provider_matcher.py.get_multiple_provider_options] Matched specialty: {specialty}")
-            break
-    
+    _, matched_specialty = _find_specialty_keyword(health_issue_lower)
+    if matched_specialty:
+        logger.debug("[provider_matcher.py.get_multiple_provider_options] Matched specialty: %s", matched_specialty)
+
     if not matched_specialty:
         matched_specialty = Specialty.GENERAL_PRACTITIONER
-        logger.info(f"[provider_matcher.py.get_multiple_provider_options] No specific match, using general practitioner")
+        logger.info("[provider_matcher.py.get_multiple_provider_options] No specific match, using general practitioner")
     
-    # Get all providers for this specialty
+    # Get all providers for this specialty (already sorted best-first by
+    # rating and experience at load time)
     providers = get_providers_by_specialty(matched_specialty)
-    logger.debug(f"[provider_matcher.py.get_multiple_provider_options] Found {len(providers)} providers for specialty: {matched_specialty}")
-    
-    # Sort by rating and experience
-    providers.sort(key=lambda p: (p.rating, p.experience_years), reverse=True)
-    
+    logger.debug("[provider_matcher.py.get_multiple_provider_options] Found %s providers for specialty: %s", len(providers), matched_specialty)
+
     # Create ProviderMatch objects
     matches = []
     for i, provider in enumerate(providers[:max_results]):
         confidence = 0.9 - (i * 0.1)  # Slightly lower confidence for subsequent matches
-        matches.append(ProviderMatch(
+        matches.append(ProviderMatch.model_construct(
             provider_id=provider.id,
             provider_name=provider.name,
             specialty=provider.specialty,
             match_reason=f"Specialty match for {matched_specialty}",
             confidence=confidence
         ))
-        logger.debug(f"[provider_matcher.py.get_multiple_provider_options] Added provider option: {provider.name} (confidence: {confidence})")
+        logger.debug("[provider_matcher.py.get_multiple_provider_options] Added provider option: %s (confidence: %s)", provider.name, confidence)
     
-    logger.info(f"[provider_matcher.py.get_multiple_provider_options] Returning {len(matches)} provider options")
+    logger.info("[provider_matcher.py.get_multiple_provider_options] Returning %s provider options", len(matches))
     return matches
+
+# Drop memoized matches whenever the provider database is reloaded
+register_change_listener(_match_provider_normalized.cache_clear)
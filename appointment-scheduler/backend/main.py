@@ -4,12 +4,15 @@ FastAPI application entry point for appointment scheduling system.
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from backend.config import config
 from backend.api import appointments, conversation
 
-# Configure logging
+# Configure logging; LOG_LEVEL env controls verbosity (default INFO so
+# hot-path debug statements stay free in production)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=getattr(logging, config.LOG_LEVEL, logging.INFO),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -19,7 +22,8 @@ logger.info("[main.py.root] Creating FastAPI application")
 app = FastAPI(
     title=config.APP_NAME,
     version=config.APP_VERSION,
-    description="LLM-powered appointment scheduling system with healthcare providers"
+    description="LLM-powered appointment scheduling system with healthcare providers",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -32,6 +36,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (availability listings, appointment lists).
+# Small payloads are served uncompressed to avoid the CPU cost.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 logger.info("[main.py.root] Including API routers")
 app.include_router(appointments.router)
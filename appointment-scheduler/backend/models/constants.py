@@ -97,8 +97,10 @@ ISSUE_TO_SPECIALTY = {
 
 
 # Time slots (in 24-hour format)
-STANDARD_TIME_SLOTS = [
+# Immutable so consumers share the one instance instead of defensively
+# copying it
+STANDARD_TIME_SLOTS = (
     "09:00", "09:30", "10:00", "10:30", "11:00", "11:30",
     "13:00", "13:30", "14:00", "14:30", "15:00", "15:30",
     "16:00", "16:30"
-]
+)
@@ -3,12 +3,18 @@ Pydantic models for the appointment scheduling system.
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Provider Models
 class Provider(BaseModel):
-    """Healthcare provider model."""
+    """Healthcare provider model.
+
+    Frozen: provider rows are loaded once from CSV and shared between the
+    in-memory indexes, so instances must never be mutated in place.
+    """
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     specialty: str
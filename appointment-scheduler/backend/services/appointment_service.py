@@ -1,9 +1,10 @@
 """
 Appointment service for creating appointments and generating .ics files.
 """
-import uuid
 import logging
+from binascii import b2a_base64
 from datetime import datetime, timedelta
+from secrets import token_hex
 from typing import Optional
 from icalendar import Calendar, Event
 from backend.models.schemas import Appointment, AppointmentCreate, AppointmentConfirmation
@@ -15,6 +16,31 @@ logger = logging.getLogger(__name__)
 # In-memory appointment storage (would be a database in production)
 _APPOINTMENTS_DB = {}
 
+# Pre-generated .ics bytes per appointment ID, computed once at creation time
+# so downloads never re-render the calendar
+_ICS_DB = {}
+
+# Callbacks invoked whenever an appointment is created, so caches keyed on
+# appointment data can invalidate themselves regardless of which write path
+# (REST endpoint or conversation tool call) performed the booking
+_change_listeners = []
+
+
+def register_change_listener(callback):
+    """
+    Register a callback to be invoked whenever an appointment is created.
+
+    Args:
+        callback: Zero-argument callable (e.g. a cache-invalidation function)
+    """
+    _change_listeners.append(callback)
+
+
+def _notify_change_listeners():
+    """Invoke all registered change listeners."""
+    for callback in _change_listeners:
+        callback()
+
 
 def create_appointment(appointment_data: AppointmentCreate) -> Optional[Appointment]:
     """
@@ -26,14 +52,14 @@ def create_appointment(appointment_data: AppointmentCreate) -> Optional[Appointm
     Returns:
         Created Appointment object or None if provider not found
     """
-    logger.info(f"[appointment_service.py.create_appointment] Creating appointment for patient: {appointment_data.patient_name}, provider: {appointment_data.provider_id}")
+    logger.info("[appointment_service.py.create_appointment] Creating appointment for patient: %s, provider: %s", appointment_data.patient_name, appointment_data.provider_id)
     
     provider = get_provider_by_id(appointment_data.provider_id)
     if not provider:
-        logger.error(f"[appointment_service.py.create_appointment] Provider not found: {appointment_data.provider_id}")
+        logger.error("[appointment_service.py.create_appointment] Provider not found: %s", appointment_data.provider_id)
         return None
     
-    logger.debug(f"[appointment_service.py.create_appointment] Provider found: {provider.name}")
+    logger.debug("[appointment_service.py.create_appointment] Provider found: %s", provider.name)
     
     # Book the slot
     success = book_slot(
@@ -43,14 +69,18 @@ def create_appointment(appointment_data: AppointmentCreate) -> Optional[Appointm
     )
     
     if not success:
-        logger.warning(f"[appointment_service.py.create_appointment] Failed to book slot for {appointment_data.date} at {appointment_data.time}")
+        logger.warning("[appointment_service.py.create_appointment] Failed to book slot for %s at %s", appointment_data.date, appointment_data.time)
         return None
     
-    logger.debug(f"[appointment_service.py.create_appointment] Slot booked successfully")
+    logger.debug("[appointment_service.py.create_appointment] Slot booked successfully")
     
     # Create appointment
-    appointment_id = str(uuid.uuid4())
-    appointment = Appointment(
+    # Internal opaque ID; no RFC-4122 structure needed, so skip the UUID
+    # object construction and hyphenated formatting
+    appointment_id = token_hex(16)
+    # Fields come from the already-validated AppointmentCreate and the
+    # provider record, so skip re-validation
+    appointment = Appointment.model_construct(
         id=appointment_id,
         patient_name=appointment_data.patient_name,
         provider_id=appointment_data.provider_id,
@@ -58,12 +88,14 @@ def create_appointment(appointment_data: AppointmentCreate) -> Optional[Appointm
         date=appointment_data.date,
         time=appointment_data.time,
         location=provider.location,
-        reason=appointment_data.reason
+        reason=appointment_data.reason,
+        created_at=datetime.now()
     )
     
     _APPOINTMENTS_DB[appointment_id] = appointment
-    logger.info(f"[appointment_service.py.create_appointment] Appointment created successfully: {appointment_id}")
-    
+    _notify_change_listeners()
+    logger.info("[appointment_service.py.create_appointment] Appointment created successfully: %s", appointment_id)
+
     return appointment
 
 
@@ -77,7 +109,7 @@ def generate_ics_file(appointment: Appointment) -> bytes:
     Returns:
         .ics file content as bytes
     """
-    logger.info(f"[appointment_service.py.generate_ics_file] Generating ICS file for appointment: {appointment.id}")
+    logger.info("[appointment_service.py.generate_ics_file] Generating ICS file for appointment: %s", appointment.id)
     
     cal = Calendar()
     cal.add('prodid', '-//Appointment Scheduler//EN')
@@ -87,10 +119,9 @@ def generate_ics_file(appointment: Appointment) -> bytes:
     event.add('summary', f'Appointment with {appointment.provider_name}')
     event.add('location', appointment.location)
     
-    # Parse date and time
-    date_obj = datetime.strptime(appointment.date, "%Y-%m-%d")
-    time_obj = datetime.strptime(appointment.time, "%H:%M").time()
-    start_datetime = datetime.combine(date_obj, time_obj)
+    # Parse date and time; both are ISO-8601 ("YYYY-MM-DD" / "HH:MM"), so
+    # fromisoformat's C fast path applies instead of strptime
+    start_datetime = datetime.fromisoformat(f"{appointment.date} {appointment.time}")
     
     event.add('dtstart', start_datetime)
     
@@ -112,7 +143,7 @@ def generate_ics_file(appointment: Appointment) -> bytes:
     cal.add_component(event)
     
     ics_bytes = cal.to_ical()
-    logger.debug(f"[appointment_service.py.generate_ics_file] ICS file generated successfully (size: {len(ics_bytes)} bytes)")
+    logger.debug("[appointment_service.py.generate_ics_file] ICS file generated successfully (size: %s bytes)", len(ics_bytes))
     
     return ics_bytes
 
@@ -129,20 +160,20 @@ def create_appointment_with_ics(
     Returns:
         AppointmentConfirmation with .ics file or None if creation failed
     """
-    logger.info(f"[appointment_service.py.create_appointment_with_ics] Creating appointment with ICS for patient: {appointment_data.patient_name}")
+    logger.info("[appointment_service.py.create_appointment_with_ics] Creating appointment with ICS for patient: %s", appointment_data.patient_name)
     
     appointment = create_appointment(appointment_data)
     if not appointment:
-        logger.error(f"[appointment_service.py.create_appointment_with_ics] Failed to create appointment")
+        logger.error("[appointment_service.py.create_appointment_with_ics] Failed to create appointment")
         return None
     
     ics_bytes = generate_ics_file(appointment)
-    
+    _ICS_DB[appointment.id] = ics_bytes
+
     # Convert to base64 for JSON transmission
-    import base64
-    ics_base64 = base64.b64encode(ics_bytes).decode('utf-8')
+    ics_base64 = b2a_base64(ics_bytes, newline=False).decode('ascii')
     
-    logger.info(f"[appointment_service.py.create_appointment_with_ics] Appointment with ICS created successfully: {appointment.id}")
+    logger.info("[appointment_service.py.create_appointment_with_ics] Appointment with ICS created successfully: %s", appointment.id)
     
     return AppointmentConfirmation(
         appointment_id=appointment.id,
@@ -155,20 +186,62 @@ def create_appointment_with_ics(
     )
 
 
+def get_appointment_ics(appointment_id: str) -> Optional[bytes]:
+    """
+    Get the .ics file bytes for an appointment.
+
+    Returns the bytes stored at creation time, generating (and storing) them
+    only for appointments created without an .ics file.
+
+    Args:
+        appointment_id: Appointment ID
+
+    Returns:
+        .ics file content as bytes or None if appointment not found
+    """
+    ics_bytes = _ICS_DB.get(appointment_id)
+    if ics_bytes is not None:
+        logger.debug("[appointment_service.py.get_appointment_ics] Returning stored ICS for appointment: %s", appointment_id)
+        return ics_bytes
+
+    appointment = _APPOINTMENTS_DB.get(appointment_id)
+    if not appointment:
+        logger.warning("[appointment_service.py.get_appointment_ics] Appointment not found: %s", appointment_id)
+        return None
+
+    ics_bytes = generate_ics_file(appointment)
+    _ICS_DB[appointment_id] = ics_bytes
+    return ics_bytes
+
+
 def get_appointment(appointment_id: str) -> Optional[Appointment]:
     """Get an appointment by ID."""
-    logger.debug(f"[appointment_service.py.get_appointment] Retrieving appointment: {appointment_id}")
+    logger.debug("[appointment_service.py.get_appointment] Retrieving appointment: %s", appointment_id)
     appointment = _APPOINTMENTS_DB.get(appointment_id)
     
     if appointment:
-        logger.debug(f"[appointment_service.py.get_appointment] Appointment found: {appointment_id}")
+        logger.debug("[appointment_service.py.get_appointment] Appointment found: %s", appointment_id)
     else:
-        logger.warning(f"[appointment_service.py.get_appointment] Appointment not found: {appointment_id}")
+        logger.warning("[appointment_service.py.get_appointment] Appointment not found: %s", appointment_id)
     
     return appointment
 
 
-def get_all_appointments() -> list:
-    """Get all appointments."""
-    logger.debug(f"[appointment_service.py.get_all_appointments] Retrieving all appointments (count: {len(_APPOINTMENTS_DB)})")
-    return list(_APPOINTMENTS_DB.values())
+def get_all_appointments(limit: Optional[int] = None, offset: int = 0) -> list:
+    """
+    Get all appointments, optionally paginated.
+
+    Args:
+        limit: Maximum number of appointments to return (None for all)
+        offset: Number of appointments to skip
+
+    Returns:
+        List of Appointment objects in insertion order
+    """
+    logger.debug("[appointment_service.py.get_all_appointments] Retrieving appointments (count: %s, limit: %s, offset: %s)", len(_APPOINTMENTS_DB), limit, offset)
+
+    appointments = list(_APPOINTMENTS_DB.values())
+    if offset or limit is not None:
+        end = None if limit is None else offset + limit
+        appointments = appointments[offset:end]
+    return appointments
@@ -3,8 +3,13 @@ Schedule service for handling availability queries.
 """
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional
-from backend.database.schedules import get_provider_schedule, get_available_slots
+from backend.database.schedules import (
+    get_provider_schedule,
+    get_available_slots,
+    register_change_listener
+)
 from backend.models.schemas import Schedule
 
 logger = logging.getLogger(__name__)
@@ -36,14 +41,18 @@ def get_next_available_dates(provider_id: str, num_dates: int = 5) -> List[str]:
     return available_dates
 
 
+@lru_cache(maxsize=256)
 def get_availability_summary(provider_id: str, num_days: int = 7) -> Dict[str, List[str]]:
     """
     Get availability summary for a provider.
-    
+
+    Results are cached until schedule data changes (a slot is booked or the
+    CSV is reloaded), which invalidates the cache via a change listener.
+
     Args:
         provider_id: Provider ID
         num_days: Number of days to check
-        
+
     Returns:
         Dictionary mapping dates to available time slots
     """
@@ -60,6 +69,10 @@ def get_availability_summary(provider_id: str, num_days: int = 7) -> Dict[str, L
     return summary
 
 
+# Invalidate cached summaries whenever schedule data changes
+register_change_listener(get_availability_summary.cache_clear)
+
+
 def find_common_availability(
     provider_id: str,
     user_preferred_dates: List[str],
@@ -0,0 +1,23 @@
+"""
+Shared test configuration.
+
+Points the schedule database at a temporary copy of the bundled CSV before
+any backend module is imported, so test bookings — and the compaction that
+persists them on process exit — never consume slots from the checked-in
+data file.
+
+Lives at the project root rather than under tests/ so that a bare pytest
+run — which also collects the scripts under backend/database/ — gets the
+same isolation.
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+_BUNDLED_SCHEDULES_CSV = Path(__file__).parent / "backend" / "database" / "schedules.csv"
+
+_schedules_dir = tempfile.mkdtemp(prefix="schedules-test-")
+_schedules_csv = Path(_schedules_dir) / "schedules.csv"
+shutil.copyfile(_BUNDLED_SCHEDULES_CSV, _schedules_csv)
+os.environ["SCHEDULES_CSV"] = str(_schedules_csv)
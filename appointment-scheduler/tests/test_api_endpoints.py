@@ -1,10 +1,15 @@
 """
 Tests for API endpoints.
 """
+import json
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
 from backend.main import app
 from backend.database.schedules import clear_schedule_cache, get_provider_schedule
+from backend.models.schemas import AppointmentCreate
+from backend.services.appointment_service import create_appointment
 
 client = TestClient(app)
 
@@ -99,6 +104,34 @@ def test_get_appointment_endpoint():
     assert data["patient_name"] == "Bob Johnson"
 
 
+def test_get_appointment_conditional_request():
+    """Test ETag handling on the appointment GET endpoint."""
+    date, time = get_available_date_and_time("p005")
+
+    appointment_data = {
+        "patient_name": "Dan Green",
+        "provider_id": "p005",
+        "date": date,
+        "time": time
+    }
+    create_response = client.post("/api/appointments/", json=appointment_data)
+    appointment_id = create_response.json()["appointment_id"]
+
+    # First fetch carries an ETag
+    response = client.get(f"/api/appointments/{appointment_id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag
+
+    # A matching If-None-Match short-circuits to 304 with no body
+    response = client.get(
+        f"/api/appointments/{appointment_id}",
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 def test_get_nonexistent_appointment():
     """Test getting nonexistent appointment."""
     response = client.get("/api/appointments/nonexistent")
@@ -135,6 +168,57 @@ def test_list_appointments_endpoint():
     assert len(data) >= 2
 
 
+def test_list_appointments_pagination():
+    """Test limit/offset pagination on the appointment list."""
+    # Ensure at least two appointments exist
+    for provider_id in ("p007", "p008"):
+        date, time = get_available_date_and_time(provider_id)
+        client.post("/api/appointments/", json={
+            "patient_name": f"Patient {provider_id}",
+            "provider_id": provider_id,
+            "date": date,
+            "time": time
+        })
+
+    full = client.get("/api/appointments/").json()
+    assert len(full) >= 2
+
+    first_page = client.get("/api/appointments/", params={"limit": 1}).json()
+    second_page = client.get("/api/appointments/", params={"limit": 1, "offset": 1}).json()
+    assert len(first_page) == 1
+    assert len(second_page) == 1
+
+    # Pages follow insertion order and don't overlap
+    assert first_page[0]["id"] == full[0]["id"]
+    assert second_page[0]["id"] == full[1]["id"]
+
+    # Invalid parameters are rejected
+    response = client.get("/api/appointments/", params={"limit": 0})
+    assert response.status_code == 422
+
+
+def test_list_cache_invalidated_by_service_layer_creation():
+    """Appointments created outside the REST route invalidate the list cache."""
+    # Prime the list cache
+    response = client.get("/api/appointments/")
+    assert response.status_code == 200
+
+    # Create an appointment through the service layer, as the conversation
+    # tool calls do, bypassing the REST route
+    date, time = get_available_date_and_time("p004")
+    appointment = create_appointment(AppointmentCreate(
+        patient_name="Carol White",
+        provider_id="p004",
+        date=date,
+        time=time
+    ))
+    assert appointment is not None
+
+    # The cached list must reflect the new appointment immediately
+    response = client.get("/api/appointments/")
+    assert appointment.id in [a["id"] for a in response.json()]
+
+
 def test_download_ics_file():
     """Test downloading .ics file."""
     date, time = get_available_date_and_time("p003")
@@ -157,6 +241,141 @@ def test_download_ics_file():
     assert b"BEGIN:VCALENDAR" in response.content
 
 
+def test_create_appointment_idempotency_key():
+    """Test that a retried create with the same Idempotency-Key doesn't rebook."""
+    date, time = get_available_date_and_time("p009")
+
+    appointment_data = {
+        "patient_name": "Eve Black",
+        "provider_id": "p009",
+        "date": date,
+        "time": time
+    }
+    headers = {"Idempotency-Key": "test-key-p009"}
+
+    first = client.post("/api/appointments/", json=appointment_data, headers=headers)
+    assert first.status_code == 200
+
+    # The slot is gone, so a non-idempotent retry would fail with 400;
+    # with the key the stored confirmation is replayed instead
+    retry = client.post("/api/appointments/", json=appointment_data, headers=headers)
+    assert retry.status_code == 200
+    assert retry.json()["appointment_id"] == first.json()["appointment_id"]
+
+
+class _StubLLMClient:
+    """Minimal LLM client double driving the tool-calling loop."""
+
+    def __init__(self, tool_call_batches):
+        self._batches = list(tool_call_batches)
+
+    async def chat_completion(self, messages, tools=None, tool_choice=None):
+        # Content stays None, like a real response that only carries tool calls
+        message = SimpleNamespace(content=None, tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def extract_tool_calls(self, response):
+        return self._batches.pop(0) if self._batches else []
+
+    def extract_message_content(self, response):
+        return response.choices[0].message.content or ""
+
+
+class _StubStreamingLLMClient:
+    """LLM double whose streaming calls replay scripted chunk sequences."""
+
+    def __init__(self, scripts):
+        self._scripts = list(scripts)
+
+    async def chat_completion_stream(self, messages, tools=None, tool_choice=None):
+        script = self._scripts.pop(0)
+
+        async def replay():
+            for chunk in script:
+                yield chunk
+
+        return replay()
+
+
+def _content_chunk(text):
+    """Build a streamed chunk carrying a text delta."""
+    delta = SimpleNamespace(tool_calls=None, content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _tool_call_chunk(index, call_id=None, name=None, arguments=None):
+    """Build a streamed chunk carrying a (possibly partial) tool-call delta."""
+    function = SimpleNamespace(name=name, arguments=arguments)
+    tool_call = SimpleNamespace(index=index, id=call_id, function=function)
+    delta = SimpleNamespace(tool_calls=[tool_call], content=None)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def test_conversation_stream_endpoint(monkeypatch):
+    """Test the SSE endpoint end to end with a scripted streaming LLM."""
+    from backend.api import conversation as conversation_api
+
+    # First completion: an identify_provider call with its arguments split
+    # across chunks, exercising the delta accumulation; second completion:
+    # the spoken reply as two text deltas
+    stub = _StubStreamingLLMClient([
+        [
+            _tool_call_chunk(0, call_id="call_1", name="identify_provider",
+                             arguments='{"health_issue": '),
+            _tool_call_chunk(0, arguments='"rash"}'),
+        ],
+        [
+            _content_chunk("I found "),
+            _content_chunk("a dermatologist for you."),
+        ],
+    ])
+    monkeypatch.setattr(conversation_api, "llm_client", stub)
+
+    response = client.post("/api/conversation/stream", json={"message": "I have a rash"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    deltas = [e["content"] for e in events if e["type"] == "delta"]
+    assert "".join(deltas) == "I found a dermatologist for you."
+
+    done = events[-1]
+    assert done["type"] == "done"
+    assert done["conversation_id"]
+    assert done["state"] == "provider_matched"
+    assert done["suggested_actions"]
+
+
+def test_conversation_returns_canned_booking_confirmation(monkeypatch):
+    """A terminal create_appointment tool result must reach the user verbatim."""
+    from backend.api import conversation as conversation_api
+
+    date, time = get_available_date_and_time("p010")
+    stub = _StubLLMClient([[{
+        "id": "call_1",
+        "function": "create_appointment",
+        "arguments": json.dumps({
+            "patient_name": "Frank Moore",
+            "provider_id": "p010",
+            "date": date,
+            "time": time,
+            "reason": "Checkup"
+        })
+    }]])
+    monkeypatch.setattr(conversation_api, "llm_client", stub)
+
+    response = client.post("/api/conversation/", json={"message": "Book it"})
+    assert response.status_code == 200
+    data = response.json()
+    # The canned confirmation from the tool result, not a generic fallback
+    assert data["response"].startswith("Your appointment is confirmed, Frank Moore")
+    assert data["state"] == "appointment_confirmed"
+
+
 def test_conversation_endpoint_without_api_key(monkeypatch):
     """Test conversation endpoint handles missing API key gracefully."""
     # This test may fail if OPENAI_API_KEY is set in environment
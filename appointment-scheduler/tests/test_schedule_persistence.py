@@ -0,0 +1,98 @@
+"""
+Tests for the schedule database's booking-log persistence.
+"""
+import pytest
+from backend.database import schedules
+from backend.database.schedules import (
+    book_slot,
+    clear_schedule_cache,
+    compact_bookings,
+    get_available_slots,
+    initialize_database
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_schedules():
+    """Reset schedule state before and after each test."""
+    clear_schedule_cache()
+    yield
+    clear_schedule_cache()
+
+
+def first_available_slot():
+    """Helper to find any provider/date/time with an open slot."""
+    for provider_id, dates in schedules.SCHEDULES_DB.items():
+        for date, schedule in dates.items():
+            if schedule.available_slots:
+                return provider_id, date, schedule.available_slots[0]
+    raise ValueError("No available slots in test data")
+
+
+def test_booking_survives_reload():
+    """A booked slot must stay booked across a flush-and-reload cycle."""
+    provider_id, date, time = first_available_slot()
+    assert book_slot(provider_id, date, time)
+
+    # clear_schedule_cache flushes queued bookings to the log before the
+    # in-memory state is replaced, and the reload replays them
+    clear_schedule_cache()
+    assert time not in get_available_slots(provider_id, date)
+
+
+def test_flush_pending_bookings_writes_queued_entries():
+    """Queued bookings become durable in the log (or compacted CSV) on flush."""
+    provider_id, date, time = first_available_slot()
+    assert book_slot(provider_id, date, time)
+
+    schedules._flush_pending_bookings()
+
+    # The booking is durable in either form: still in the log, or already
+    # folded into the CSV if the background flusher won the race
+    log_text = schedules.BOOKING_LOG.read_text() if schedules.BOOKING_LOG.exists() else ""
+    csv_text = schedules.CSV_FILE.read_text()
+    if f"{provider_id},{date},{time}" not in log_text:
+        for row in csv_text.splitlines():
+            if row.startswith(f"{provider_id},{date},"):
+                assert time not in row
+                break
+        else:
+            pytest.fail("Provider/date row missing from CSV")
+
+
+def test_replay_applies_residual_log_and_compacts():
+    """Residual log entries left by a crash are replayed on initialization."""
+    provider_id, date, time = first_available_slot()
+
+    # Simulate a process that logged a booking but died before compacting
+    with open(schedules.BOOKING_LOG, 'a', encoding='utf-8') as f:
+        f.write(f"{provider_id},{date},{time}\n")
+
+    initialize_database()
+    assert time not in get_available_slots(provider_id, date)
+    # Replay folds the log into the CSV and removes it
+    assert not schedules.BOOKING_LOG.exists()
+
+
+def test_compaction_persists_booking_and_truncates_log():
+    """Compaction folds bookings into the CSV and removes the log."""
+    provider_id, date, time = first_available_slot()
+    assert book_slot(provider_id, date, time)
+
+    assert compact_bookings()
+    assert not schedules.BOOKING_LOG.exists()
+
+    # The CSV row for this provider/date no longer contains the slot
+    for row in schedules.CSV_FILE.read_text().splitlines():
+        if row.startswith(f"{provider_id},{date},"):
+            assert time not in row
+            break
+    else:
+        pytest.fail("Provider/date row missing from CSV")
+
+
+def test_double_booking_rejected():
+    """The same slot cannot be booked twice."""
+    provider_id, date, time = first_available_slot()
+    assert book_slot(provider_id, date, time)
+    assert not book_slot(provider_id, date, time)